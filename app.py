@@ -1,331 +1,603 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import json
+from flask_compress import Compress
+import asyncio
+import atexit
+import hashlib
+import logging
+import queue
 import re
+import secrets
+from collections import namedtuple
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import Dict, List, Any
+from decimal import Decimal
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional
 import os
 import sys
+import threading
+import time
 from dotenv import load_dotenv
+from cachetools import TTLCache
+from eth_account import Account
+import orjson
 
 # Load environment variables
 load_dotenv()
 
+# Request threads only enqueue log records; a background listener thread writes them to stderr
+# (QueueHandler gets basicConfig's format and hands over the finished line)
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush queued records on shutdown
+logger = logging.getLogger(__name__)
+
 # Import agents
 from swap_agent import SwapAgent
-from blockchain_integration import blockchain_integrator
-from wallet_manager import wallet_manager
+from blockchain_integration import blockchain_integrator, gas_oracle, EXPLORER_TX_URL
+from wallet_manager import wallet_manager, normalize_tx_hash
 from phishing_detector import phishing_detector
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson - jsonify and app.json serialize in C"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress JSON responses for clients that accept it; tiny bodies are sent as-is
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+# Werkzeug answers 413 before buffering anything larger (bulk authorization is the biggest legit body)
+app.config['MAX_CONTENT_LENGTH'] = 128 * 1024
+
 # Global agent instances
 swap_agent = SwapAgent()
 
+# Demo wallet - connected lazily on first use (not at import), and again whenever
+# a private-key or seed-phrase authorization has replaced it in wallet_manager
+DEMO_PRIVATE_KEY = os.getenv('DEMO_PRIVATE_KEY')
+_demo_wallet_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def demo_wallet_address() -> Optional[str]:
+    """Lowercased address of DEMO_PRIVATE_KEY (None if the key is invalid - connecting reports why)"""
+    try:
+        return Account.from_key(DEMO_PRIVATE_KEY).address.lower()
+    except Exception:
+        return None
+
+def connect_demo_wallet() -> Dict[str, Any]:
+    """Make the demo wallet the connected one - reconnects only if it is missing or was replaced"""
+    if not DEMO_PRIVATE_KEY:
+        return {'success': False, 'error': 'DEMO_PRIVATE_KEY not configured'}
+    
+    with _demo_wallet_lock:
+        connected = wallet_manager.connected_wallet
+        if connected and connected.address.lower() == demo_wallet_address():
+            return {'success': True, 'message': 'Demo wallet already connected'}
+        
+        blockchain_integrator.private_key = DEMO_PRIVATE_KEY
+        result = wallet_manager.connect_with_private_key(DEMO_PRIVATE_KEY)
+    
+    if result['success']:
+        logger.info("Wallet connected: %s", result['message'])
+    else:
+        logger.error("Wallet connection error: %s", result['error'])
+    return result
+
+# Phishing checks are async - one long-lived event loop in a daemon thread runs them all,
+# instead of building (and tearing down) a loop or a thread pool per verify request
+_verify_loop = asyncio.new_event_loop()
+threading.Thread(target=_verify_loop.run_forever, name='verify-loop', daemon=True).start()
+
+# In-flight lookups by address - only touched from _verify_loop, so no lock is needed
+_verify_inflight = {}
+
+async def _verify_single_flight(address: str) -> dict:
+    """Concurrent verifies of the same address share one upstream lookup"""
+    key = address.lower()
+    task = _verify_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(phishing_detector.verify_address(address))
+        _verify_inflight[key] = task
+        task.add_done_callback(lambda _: _verify_inflight.pop(key, None))
+    # shield: one caller timing out must not cancel the lookup the others are waiting on
+    return await asyncio.shield(task)
+
+# Tokens the transfer handlers accept
+_SUPPORTED_TOKENS = frozenset({'ETH', 'WETH', 'USDT', 'USDC', 'RISE'})
+
+# Native ETH needs no approval before a swap
+_NATIVE_TOKENS = frozenset({'ETH', 'WETH'})
+
+# Swap pattern word -> token symbol (exact, case-insensitive lookup of the captured word)
+_TOKEN_MAP = MappingProxyType({
+    'usdt': 'USDT', 'usdc': 'USDC', 'eth': 'WETH',
+    'weth': 'WETH', 'dai': 'DAI', 'rise': 'RISE',
+    'ethereum': 'WETH', 'tether': 'USDT', 'makerdao': 'DAI'
+})
+
+# Chat parsing patterns - compiled once at import instead of on every message
+_AMOUNT_RE = re.compile(r'(\d+(?:\.\d+)?)')
+_ADDR_RE = re.compile(r'0x[0-9a-fA-F]{40}\Z')
+_TX_HASH_RE = re.compile(r'0x[0-9a-fA-F]{64}\Z')
+
+# Token names by canonical symbol, detected with one alternation regex:
+# each symbol is a named group, so match.lastgroup is the symbol itself
+_TOKEN_ALIASES = {
+    'ETH': ('eth', 'ethereum'),
+    'WETH': ('weth', 'wrapped eth'),
+    'USDT': ('usdt', 'tether'),
+    'USDC': ('usdc', 'usd coin'),
+    'DAI': ('dai', 'makerdao'),
+    'RISE': ('rise', 'rise token'),
+}
+_TOKEN_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        f'(?P<{symbol}>' + '|'.join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True)) + ')'
+        for symbol, aliases in _TOKEN_ALIASES.items()
+    ) + r')\b',
+    re.IGNORECASE
+)
+
+# Swap pattern (English and Turkish support): "<amount> <token> to|for|mi|yi|den <token>".
+# Captures are token-shaped, so there are no open-ended .+? groups to backtrack over.
+_SWAP_RE = re.compile(
+    r'\d+(?:\.\d+)?\s*(?P<from>[A-Za-z]{2,10})\s+(?:to|for|mi|yi|den)\s+(?P<to>[A-Za-z]{2,10})',
+    re.IGNORECASE
+)
+
+# First-pass routing, one scan for every command: verify and transfer need one of
+# their keywords plus an address; every token alias and swap-map key contains one of
+# the swap hints, so a message without any can never parse as a swap.
+# Lookahead so overlapping hits ("risend", "sendai") are all reported.
+_INTENT_RE = re.compile(
+    r'(?=(?P<verify>verify|check|analyze|güvenlik|kontrol)'
+    r'|(?P<transfer>send|transfer|gönder)'
+    r'|(?P<swap>eth|usd|dai|rise|makerdao))',
+    re.IGNORECASE
+)
+_ADDRESS_INTENTS = frozenset(('verify', 'transfer'))
+
+# Swap requests are short - longer messages are only parsed up to this length
+_MAX_SWAP_MESSAGE_LENGTH = 512
+# Transfer messages longer than this (huge bulk lists) are parsed without the cache
+_MAX_CACHED_TRANSFER_MESSAGE_LENGTH = 4096
+
+# Bulk transfer patterns: send amount token to address1,address2,address3
+# (address list is comma-separated with no optional parts, so it matches in one linear pass)
+_BULK_TRANSFER_RES = tuple(re.compile(pattern) for pattern in (
+    r'send\s+(\d+(?:\.\d+)?)\s+(\w+)\s+to\s+(0x[a-fA-F0-9]{40}(?:\s*,\s*0x[a-fA-F0-9]{40})*)',  # send 0.1 eth to 0x123,0x456,0x789
+    r'transfer\s+(\d+(?:\.\d+)?)\s+(\w+)\s+to\s+(0x[a-fA-F0-9]{40}(?:\s*,\s*0x[a-fA-F0-9]{40})*)',  # transfer 0.1 eth to 0x123,0x456
+    r'gönder\s+(\d+(?:\.\d+)?)\s+(\w+)\s+(0x[a-fA-F0-9]{40}(?:\s*,\s*0x[a-fA-F0-9]{40})*)',  # Turkish: gönder 0.1 eth 0x123,0x456
+))
+
+# Single transfer patterns: send amount token address (legacy support)
+_SINGLE_TRANSFER_RES = tuple(re.compile(pattern) for pattern in (
+    r'send\s+(\d+(?:\.\d+)?)\s+(\w+)\s+(0x[a-fA-F0-9]{40})',  # send 0.1 eth 0x123...
+    r'transfer\s+(\d+(?:\.\d+)?)\s+(\w+)\s+to\s+(0x[a-fA-F0-9]{40})',  # transfer 0.1 eth to 0x123...
+    r'gönder\s+(\d+(?:\.\d+)?)\s+(\w+)\s+(0x[a-fA-F0-9]{40})',  # Turkish: gönder 0.1 eth 0x123...
+))
+
+# Verify patterns, tried in order - the first keyword that matches wins
+_VERIFY_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'verify\s+(0x[a-fA-F0-9]{40})',  # verify 0x123...
+    r'check\s+(0x[a-fA-F0-9]{40})',   # check 0x123...
+    r'analyze\s+(0x[a-fA-F0-9]{40})', # analyze 0x123...
+    r'güvenlik\s+(0x[a-fA-F0-9]{40})', # Turkish: güvenlik 0x123...
+    r'kontrol\s+(0x[a-fA-F0-9]{40})'  # Turkish: kontrol 0x123...
+))
+
+# Literal substrings every swap / transfer pattern needs - a cheap `in` check
+# rules out most chat messages before any regex runs
+_SWAP_KEYWORDS = ('to', 'for', 'mi', 'yi', 'den')
+_TRANSFER_KEYWORDS = ('send', 'transfer', 'gönder')
+
+# Read-only description of one error type
+ErrorInfo = namedtuple('ErrorInfo', 'code message retry')
+
+_RETRY_MESSAGE = '\n\n🔄 **Click "Try Again" to retry this operation**'
+
+# Error keywords in priority order - classify_error returns the first category with a hit
+_ERROR_KEYWORDS = (
+    ('INSUFFICIENT_BALANCE', ('insufficient', 'balance', 'not enough')),
+    ('NETWORK_ERROR', ('network', 'connection', 'rpc', 'timeout')),
+    ('SLIPPAGE_TOO_HIGH', ('slippage', 'price impact', 'high impact')),
+    ('UNSUPPORTED_TOKEN', ('unsupported', 'invalid token', 'token not found')),
+    ('GAS_ESTIMATION_FAILED', ('gas', 'estimation failed', 'gas limit')),
+    ('WALLET_NOT_CONNECTED', ('wallet', 'not connected', 'no wallet')),
+    ('TRANSACTION_FAILED', ('transaction failed', 'tx failed', 'reverted')),
+    ('ROUTE_NOT_FOUND', ('route', 'path', 'no route found')),
+    ('APPROVAL_REQUIRED', ('approval', 'approve', 'allowance')),
+    ('INVALID_AMOUNT', ('amount', 'invalid amount', 'zero amount')),
+)
+_ERROR_TYPE_PRIORITY = {error_type: priority for priority, (error_type, _) in enumerate(_ERROR_KEYWORDS)}
+# Lookahead alternation with one named group per category: a single case-insensitive
+# pass finds keyword hits at every position and lastgroup names their category
+_ERROR_KEYWORD_RE = re.compile(
+    '(?=' + '|'.join(
+        f'(?P<{error_type}>' + '|'.join(re.escape(keyword) for keyword in keywords) + ')'
+        for error_type, keywords in _ERROR_KEYWORDS
+    ) + ')',
+    re.IGNORECASE
+)
+
 class SwapErrorHandler:
     """Comprehensive error handling for swap operations"""
     
-    ERROR_TYPES = {
-        'INSUFFICIENT_BALANCE': {
-            'code': 'INSUFFICIENT_BALANCE',
-            'message': '❌ **Insufficient Balance**\n\n💰 Your wallet doesn\'t have enough tokens for this swap.\n\n💡 **Solutions:**\n• Check your token balance\n• Try a smaller amount\n• Add more funds to your wallet',
-            'retry': True
-        },
-        'NETWORK_ERROR': {
-            'code': 'NETWORK_ERROR',
-            'message': '❌ **Network Connection Error**\n\n🌐 Unable to connect to the blockchain network.\n\n💡 **Solutions:**\n• Check your internet connection\n• Switch to a different RPC endpoint\n• Try again in a few moments',
-            'retry': True
-        },
-        'SLIPPAGE_TOO_HIGH': {
-            'code': 'SLIPPAGE_TOO_HIGH',
-            'message': '❌ **High Slippage Detected**\n\n📈 Price impact is too high for this trade.\n\n💡 **Solutions:**\n• Try a smaller amount\n• Increase slippage tolerance\n• Wait for better market conditions',
-            'retry': True
-        },
-        'UNSUPPORTED_TOKEN': {
-            'code': 'UNSUPPORTED_TOKEN',
-            'message': '❌ **Unsupported Token**\n\n🪙 One or more tokens are not supported.\n\n💡 **Supported tokens:** ETH, USDC, USDT, RISE\n\n🔄 **Try:** "0.1 ETH to USDC" or "5 USDT to RISE"',
-            'retry': True
-        },
-        'GAS_ESTIMATION_FAILED': {
-            'code': 'GAS_ESTIMATION_FAILED',
-            'message': '❌ **Gas Estimation Failed**\n\n⛽ Unable to estimate gas costs for this transaction.\n\n💡 **Solutions:**\n• Check token balances and allowances\n• Verify contract addresses\n• Try again with a different amount',
-            'retry': True
-        },
-        'WALLET_NOT_CONNECTED': {
-            'code': 'WALLET_NOT_CONNECTED',
-            'message': '❌ **Wallet Not Connected**\n\n👛 Please connect your wallet first.\n\n💡 **Steps:**\n• Click "Connect Wallet" button\n• Choose your preferred wallet\n• Authorize the connection',
-            'retry': False
-        },
-        'TRANSACTION_FAILED': {
-            'code': 'TRANSACTION_FAILED',
-            'message': '❌ **Transaction Failed**\n\n🔄 The blockchain transaction was rejected.\n\n💡 **Common causes:**\n• Insufficient gas\n• Token approval needed\n• Network congestion\n• Price changed during execution',
-            'retry': True
-        },
-        'ROUTE_NOT_FOUND': {
-            'code': 'ROUTE_NOT_FOUND',
-            'message': '❌ **No Trading Route Found**\n\n🛣️ No available path for this token pair.\n\n💡 **Solutions:**\n• Try different token pairs\n• Check if tokens exist on this network\n• Use intermediate tokens (ETH/USDC)',
-            'retry': True
-        },
-        'APPROVAL_REQUIRED': {
-            'code': 'APPROVAL_REQUIRED',
-            'message': '⚠️ **Token Approval Required**\n\n🔐 You need to approve token spending first.\n\n💡 **Next steps:**\n• Approve token spending\n• Wait for confirmation\n• Try the swap again',
-            'retry': True
-        },
-        'PRICE_IMPACT_HIGH': {
-            'code': 'PRICE_IMPACT_HIGH',
-            'message': '⚠️ **High Price Impact Warning**\n\n📊 This trade will significantly affect token price.\n\n💡 **Consider:**\n• Reducing trade size\n• Splitting into smaller trades\n• Waiting for better liquidity',
-            'retry': True
-        },
-        'TIMEOUT_ERROR': {
-            'code': 'TIMEOUT_ERROR',
-            'message': '❌ **Transaction Timeout**\n\n⏱️ Transaction took too long to process.\n\n💡 **Solutions:**\n• Check transaction status on explorer\n• Increase gas price for faster processing\n• Try again with higher gas limit',
-            'retry': True
-        },
-        'INVALID_AMOUNT': {
-            'code': 'INVALID_AMOUNT',
-            'message': '❌ **Invalid Amount**\n\n💯 Please enter a valid positive amount.\n\n💡 **Examples:**\n• "0.1 ETH to USDC"\n• "50 USDT to ETH"\n• "1.5 RISE to USDC"',
-            'retry': True
-        },
-        'GENERIC_ERROR': {
-            'code': 'GENERIC_ERROR',
-            'message': '❌ **Something Went Wrong**\n\n🔧 An unexpected error occurred.\n\n💡 **Solutions:**\n• Try again in a few moments\n• Check your wallet connection\n• Contact support if problem persists',
-            'retry': True
-        }
-    }
+    ERROR_TYPES = MappingProxyType({
+        'INSUFFICIENT_BALANCE': ErrorInfo(
+            code='INSUFFICIENT_BALANCE',
+            message='❌ **Insufficient Balance**\n\n💰 Your wallet doesn\'t have enough tokens for this swap.\n\n💡 **Solutions:**\n• Check your token balance\n• Try a smaller amount\n• Add more funds to your wallet',
+            retry=True
+        ),
+        'NETWORK_ERROR': ErrorInfo(
+            code='NETWORK_ERROR',
+            message='❌ **Network Connection Error**\n\n🌐 Unable to connect to the blockchain network.\n\n💡 **Solutions:**\n• Check your internet connection\n• Switch to a different RPC endpoint\n• Try again in a few moments',
+            retry=True
+        ),
+        'SLIPPAGE_TOO_HIGH': ErrorInfo(
+            code='SLIPPAGE_TOO_HIGH',
+            message='❌ **High Slippage Detected**\n\n📈 Price impact is too high for this trade.\n\n💡 **Solutions:**\n• Try a smaller amount\n• Increase slippage tolerance\n• Wait for better market conditions',
+            retry=True
+        ),
+        'UNSUPPORTED_TOKEN': ErrorInfo(
+            code='UNSUPPORTED_TOKEN',
+            message='❌ **Unsupported Token**\n\n🪙 One or more tokens are not supported.\n\n💡 **Supported tokens:** ETH, USDC, USDT, RISE\n\n🔄 **Try:** "0.1 ETH to USDC" or "5 USDT to RISE"',
+            retry=True
+        ),
+        'GAS_ESTIMATION_FAILED': ErrorInfo(
+            code='GAS_ESTIMATION_FAILED',
+            message='❌ **Gas Estimation Failed**\n\n⛽ Unable to estimate gas costs for this transaction.\n\n💡 **Solutions:**\n• Check token balances and allowances\n• Verify contract addresses\n• Try again with a different amount',
+            retry=True
+        ),
+        'WALLET_NOT_CONNECTED': ErrorInfo(
+            code='WALLET_NOT_CONNECTED',
+            message='❌ **Wallet Not Connected**\n\n👛 Please connect your wallet first.\n\n💡 **Steps:**\n• Click "Connect Wallet" button\n• Choose your preferred wallet\n• Authorize the connection',
+            retry=False
+        ),
+        'TRANSACTION_FAILED': ErrorInfo(
+            code='TRANSACTION_FAILED',
+            message='❌ **Transaction Failed**\n\n🔄 The blockchain transaction was rejected.\n\n💡 **Common causes:**\n• Insufficient gas\n• Token approval needed\n• Network congestion\n• Price changed during execution',
+            retry=True
+        ),
+        'ROUTE_NOT_FOUND': ErrorInfo(
+            code='ROUTE_NOT_FOUND',
+            message='❌ **No Trading Route Found**\n\n🛣️ No available path for this token pair.\n\n💡 **Solutions:**\n• Try different token pairs\n• Check if tokens exist on this network\n• Use intermediate tokens (ETH/USDC)',
+            retry=True
+        ),
+        'APPROVAL_REQUIRED': ErrorInfo(
+            code='APPROVAL_REQUIRED',
+            message='⚠️ **Token Approval Required**\n\n🔐 You need to approve token spending first.\n\n💡 **Next steps:**\n• Approve token spending\n• Wait for confirmation\n• Try the swap again',
+            retry=True
+        ),
+        'PRICE_IMPACT_HIGH': ErrorInfo(
+            code='PRICE_IMPACT_HIGH',
+            message='⚠️ **High Price Impact Warning**\n\n📊 This trade will significantly affect token price.\n\n💡 **Consider:**\n• Reducing trade size\n• Splitting into smaller trades\n• Waiting for better liquidity',
+            retry=True
+        ),
+        'TIMEOUT_ERROR': ErrorInfo(
+            code='TIMEOUT_ERROR',
+            message='❌ **Transaction Timeout**\n\n⏱️ Transaction took too long to process.\n\n💡 **Solutions:**\n• Check transaction status on explorer\n• Increase gas price for faster processing\n• Try again with higher gas limit',
+            retry=True
+        ),
+        'INVALID_AMOUNT': ErrorInfo(
+            code='INVALID_AMOUNT',
+            message='❌ **Invalid Amount**\n\n💯 Please enter a valid positive amount.\n\n💡 **Examples:**\n• "0.1 ETH to USDC"\n• "50 USDT to ETH"\n• "1.5 RISE to USDC"',
+            retry=True
+        ),
+        'GENERIC_ERROR': ErrorInfo(
+            code='GENERIC_ERROR',
+            message='❌ **Something Went Wrong**\n\n🔧 An unexpected error occurred.\n\n💡 **Solutions:**\n• Try again in a few moments\n• Check your wallet connection\n• Contact support if problem persists',
+            retry=True
+        )
+    })
+    
+    # Static part of each error response, built once and frozen - callers get a copy
+    RESPONSE_TEMPLATES = MappingProxyType({
+        error_type: MappingProxyType({
+            'type': 'swap_error',
+            'error_code': error_info.code,
+            'message': error_info.message + _RETRY_MESSAGE if error_info.retry else error_info.message,
+            'can_retry': error_info.retry,
+            **({'retry_message': _RETRY_MESSAGE} if error_info.retry else {})
+        })
+        for error_type, error_info in ERROR_TYPES.items()
+    })
     
     @classmethod
-    def get_error_response(cls, error_type: str, custom_message: str = None, tx_hash: str = None) -> dict:
+    def get_error_response(cls, error_type: str, custom_message: str = None, tx_hash: str = None, now_iso: str = None) -> dict:
         """Get formatted error response with retry option"""
-        error_info = cls.ERROR_TYPES.get(error_type, cls.ERROR_TYPES['GENERIC_ERROR'])
+        response = dict(cls.RESPONSE_TEMPLATES.get(error_type) or cls.RESPONSE_TEMPLATES['GENERIC_ERROR'])
+        response['timestamp'] = now_iso or datetime.now().isoformat()
         
-        response = {
-            'type': 'swap_error',
-            'error_code': error_info['code'],
-            'message': custom_message or error_info['message'],
-            'can_retry': error_info['retry'],
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        if error_info['retry']:
-            response['retry_message'] = '\n\n🔄 **Click "Try Again" to retry this operation**'
-            response['message'] += response['retry_message']
+        if custom_message:
+            response['message'] = custom_message + _RETRY_MESSAGE if response['can_retry'] else custom_message
         
         if tx_hash:
             response['tx_hash'] = tx_hash
-            response['explorer_url'] = f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash}"
+            response['explorer_url'] = EXPLORER_TX_URL.format(tx_hash)
         
         return response
     
     @classmethod
     def classify_error(cls, error_message: str, exception: Exception = None) -> str:
         """Classify error type based on error message or exception"""
-        error_lower = error_message.lower()
-        
-        if any(term in error_lower for term in ['insufficient', 'balance', 'not enough']):
-            return 'INSUFFICIENT_BALANCE'
-        elif any(term in error_lower for term in ['network', 'connection', 'rpc', 'timeout']):
-            return 'NETWORK_ERROR'
-        elif any(term in error_lower for term in ['slippage', 'price impact', 'high impact']):
-            return 'SLIPPAGE_TOO_HIGH'
-        elif any(term in error_lower for term in ['unsupported', 'invalid token', 'token not found']):
-            return 'UNSUPPORTED_TOKEN'
-        elif any(term in error_lower for term in ['gas', 'estimation failed', 'gas limit']):
-            return 'GAS_ESTIMATION_FAILED'
-        elif any(term in error_lower for term in ['wallet', 'not connected', 'no wallet']):
-            return 'WALLET_NOT_CONNECTED'
-        elif any(term in error_lower for term in ['transaction failed', 'tx failed', 'reverted']):
-            return 'TRANSACTION_FAILED'
-        elif any(term in error_lower for term in ['route', 'path', 'no route found']):
-            return 'ROUTE_NOT_FOUND'
-        elif any(term in error_lower for term in ['approval', 'approve', 'allowance']):
-            return 'APPROVAL_REQUIRED'
-        elif any(term in error_lower for term in ['amount', 'invalid amount', 'zero amount']):
-            return 'INVALID_AMOUNT'
-        else:
-            return 'GENERIC_ERROR'
+        categories = {match.lastgroup for match in _ERROR_KEYWORD_RE.finditer(error_message)}
+        return min(categories, key=_ERROR_TYPE_PRIORITY.__getitem__) if categories else 'GENERIC_ERROR'
 
-class ChatAI:
-    def __init__(self):
-        self.conversation_history = []
-        self.error_handler = SwapErrorHandler()
-        
-    def parse_swap_request(self, message: str) -> dict:
-        """Extract swap request from natural language message"""
-        
-        # Amount patterns
-        amount_pattern = r'(\d+(?:\.\d+)?)'
-        
-        # Token patterns
-        token_patterns = {
-            r'\b(?:eth|ethereum)\b': 'ETH',
-            r'\b(?:weth|wrapped eth)\b': 'WETH', 
-            r'\b(?:usdt|tether)\b': 'USDT',
-            r'\b(?:usdc|usd coin)\b': 'USDC',
-            r'\b(?:dai|makerdao)\b': 'DAI',
-            r'\b(?:rise|rise token)\b': 'RISE'
-        }
-        
-        # Swap patterns (English and Turkish support)
-        swap_patterns = [
-            r'(.+?)\s+(?:mi|yi|i)\s+(.+?)\s+(?:yap|yapmak|çevir|swap)',  # Turkish patterns
-            r'(.+?)\s+to\s+(.+)',  # English patterns
-            r'(.+?)\s+den\s+(.+?)\s+ya',  # Turkish patterns
-            r'swap\s+(.+?)\s+(?:to|for)\s+(.+)',  # English patterns
-            r'(\d+(?:\.\d+)?)\s*([a-zA-Z]+)\s+(?:to|mi|yi)\s+([a-zA-Z]+)'  # Mixed patterns
-        ]
-        
-        # Find amount
-        amount_match = re.search(amount_pattern, message)
-        amount = float(amount_match.group(1)) if amount_match else 1.0
-        
-        # Find tokens
-        found_tokens = []
-        for pattern, token in token_patterns.items():
-            if re.search(pattern, message):
-                found_tokens.append(token)
-        
-        # Analyze swap pattern
-        from_token = None
-        to_token = None
-        
-        for pattern in swap_patterns:
-            match = re.search(pattern, message)
-            if match:
-                if len(match.groups()) == 3:  # amount + token + token format
-                    from_token_text = match.group(2).upper()
-                    to_token_text = match.group(3).upper()
-                else:  # token + token format
-                    from_token_text = match.group(1).strip()
-                    to_token_text = match.group(2).strip()
-                
-                # Token mapping
-                token_map = {
-                    'usdt': 'USDT', 'usdc': 'USDC', 'eth': 'WETH', 
-                    'weth': 'WETH', 'dai': 'DAI', 'rise': 'RISE'
-                }
-                
-                for key, value in token_map.items():
-                    if key in from_token_text.lower():
-                        from_token = value
-                    if key in to_token_text.lower():
-                        to_token = value
-                break
-        
-        # If no pattern matched, extract from found tokens
-        if not from_token and not to_token and len(found_tokens) >= 2:
-            from_token = found_tokens[0]
-            to_token = found_tokens[1]
-        
-        return {
-            'is_swap_request': bool(from_token and to_token),
-            'from_token': from_token,
-            'to_token': to_token,
-            'amount': amount,
-            'original_message': message
-        }
+class StaticResponse(dict):
+    """Chat reply that never changes - its JSON is serialized once and reused"""
     
-    def parse_transfer_request(self, message: str) -> dict:
-        """Extract transfer request from natural language message - supports bulk transfers"""
-        
-        # Token mapping
-        token_map = {
-            'ETH': 'ETH', 'WETH': 'WETH', 'USDT': 'USDT', 
-            'USDC': 'USDC', 'DAI': 'DAI', 'RISE': 'RISE'
-        }
-        
-        # Bulk transfer patterns: send amount token to address1,address2,address3
-        bulk_transfer_patterns = [
-            r'send\s+(\d+(?:\.\d+)?)\s+(\w+)\s+to\s+((?:0x[a-fA-F0-9]{40}(?:\s*,\s*)?)+)',  # send 0.1 eth to 0x123,0x456,0x789
-            r'transfer\s+(\d+(?:\.\d+)?)\s+(\w+)\s+to\s+((?:0x[a-fA-F0-9]{40}(?:\s*,\s*)?)+)',  # transfer 0.1 eth to 0x123,0x456
-            r'gönder\s+(\d+(?:\.\d+)?)\s+(\w+)\s+((?:0x[a-fA-F0-9]{40}(?:\s*,\s*)?)+)',  # Turkish: gönder 0.1 eth 0x123,0x456
-        ]
-        
-        # Check for bulk transfers first
-        for pattern in bulk_transfer_patterns:
-            match = re.search(pattern, message.lower())
-            if match:
-                amount = float(match.group(1))
-                token = match.group(2).upper()
-                addresses_str = match.group(3)
-                
-                # Parse addresses from comma-separated string
-                addresses = []
-                for addr in addresses_str.split(','):
-                    addr = addr.strip()
-                    if len(addr) == 42 and addr.startswith('0x'):
-                        addresses.append(addr)
-                
-                mapped_token = token_map.get(token, token)
-                
-                if len(addresses) > 1:  # Bulk transfer
-                    return {
-                        'is_transfer_request': True,
-                        'is_bulk_transfer': True,
-                        'amount': amount,
-                        'token': mapped_token,
-                        'receivers': addresses,
-                        'receiver_count': len(addresses),
-                        'total_amount': amount * len(addresses),
-                        'original_message': message
-                    }
-                elif len(addresses) == 1:  # Single transfer
-                    return {
-                        'is_transfer_request': True,
-                        'is_bulk_transfer': False,
-                        'amount': amount,
-                        'token': mapped_token,
-                        'receiver': addresses[0],
-                        'original_message': message
-                    }
-        
-        # Single transfer patterns: send amount token address (legacy support)
-        single_transfer_patterns = [
-            r'send\s+(\d+(?:\.\d+)?)\s+(\w+)\s+(0x[a-fA-F0-9]{40})',  # send 0.1 eth 0x123...
-            r'transfer\s+(\d+(?:\.\d+)?)\s+(\w+)\s+to\s+(0x[a-fA-F0-9]{40})',  # transfer 0.1 eth to 0x123...
-            r'gönder\s+(\d+(?:\.\d+)?)\s+(\w+)\s+(0x[a-fA-F0-9]{40})',  # Turkish: gönder 0.1 eth 0x123...
-        ]
-        
-        for pattern in single_transfer_patterns:
-            match = re.search(pattern, message.lower())
-            if match:
-                amount = float(match.group(1))
-                token = match.group(2).upper()
-                receiver = match.group(3)
-                
-                mapped_token = token_map.get(token, token)
-                
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.json = app.json.dumps(self)
+
+# Static chat replies - built once, handle_general_message returns them as-is
+_HELP_KEYWORDS = ('yardım', 'help', 'nasıl', 'ne yapabilirim', 'how', 'what can')
+_INFO_KEYWORDS = ('token', 'fiyat', 'price', 'balance', 'bakiye', 'info', 'information')
+# Keywords match anywhere in the message ("tokens", "show"), so each set is one
+# substring alternation - a single scan instead of one `in` check per keyword
+_HELP_KEYWORDS_RE = re.compile('|'.join(re.escape(word) for word in _HELP_KEYWORDS))
+_INFO_KEYWORDS_RE = re.compile('|'.join(re.escape(word) for word in _INFO_KEYWORDS))
+
+_HELP_RESPONSE = StaticResponse({
+    'type': 'help',
+    'message': """💱 **Welcome to AI Swap Assistant!**
+
+🔄 **For swap operations:**
+• "0.1 ETH to USDT"
+• "5 ETH to USDC"
+• "2 ETH to RISE"
+
+💸 **For transfers:**
+• "send 0.1 eth 0x742d35Cc6634C0532925a3b8D5C2d3b5c5b5b5b5"
+• "transfer 0.001 usdt to 0x123..."
+• "gönder 0.5 rise 0xabc..."
+
+🛡️ **For security:**
+• "verify 0x123..." - Check address safety
+• "check 0x456..." - Phishing detection
+
+🪙 **Supported tokens:**
+• ETH, USDT, USDC, RISE
+
+⚡ **Real transactions on RISE Chain testnet!**
+
+💡 **What would you like to do?**""",
+    'can_retry': False
+})
+
+_TOKEN_INFO_RESPONSE = StaticResponse({
+    'type': 'token_info',
+    'message': """📊 **Token Information**
+
+🪙 **Supported tokens:**
+• ETH (Ethereum)
+• USDT (Tether USD)
+• USDC (USD Coin) 
+• RISE (RISE Token)
+
+💱 **Swap examples:**
+• "0.1 ETH to USDT"
+• "50 USDC to ETH" 
+• "1 ETH to RISE"
+
+🛡️ **Security features:**
+• "verify 0x123..." - Check address safety
+• "check 0x456..." - Phishing detection
+
+⚡ **Real RISE Chain testnet transactions**
+
+💡 **How else can I help you?**""",
+    'can_retry': False
+})
+
+_GENERAL_MESSAGE_TEMPLATE = """👋 **Hello!**
+
+💱 I'm your AI Swap Assistant. I can help you with token swap operations on RISE Chain testnet.
+
+🔄 **For token swaps:**
+• "0.1 ETH to USDT"
+• "2 ETH to RISE"
+• "5 USDC to ETH"
+
+🛡️ **For security checks:**
+• "verify 0x123..." - Check address safety
+• "check 0x456..." - Phishing detection
+
+💡 **Type "help" for more information!**
+
+---
+*Your message: "{message}"*"""
+
+# Parsing is pure, so repeated messages (retries, UI presets) are served from cache.
+# Keys are length-capped and the cached dicts leave out the message itself (ChatAI adds
+# original_message to a copy), so the caches never pin large request bodies.
+@lru_cache(maxsize=1024)
+def _parse_swap(text: str) -> dict:
+    """Extract swap request from a message already cut to _MAX_SWAP_MESSAGE_LENGTH"""
+    
+    # Find amount
+    amount_match = _AMOUNT_RE.search(text)
+    amount = float(amount_match.group(1)) if amount_match else 1.0
+    
+    # Find tokens (deduplicated, in the order they appear)
+    found_tokens = list(dict.fromkeys(match.lastgroup for match in _TOKEN_RE.finditer(text)))
+    
+    # Analyze swap pattern
+    from_token = None
+    to_token = None
+    
+    # Skip the swap regex entirely when none of its keywords appear
+    text_lower = text.lower()
+    match = _SWAP_RE.search(text) if any(keyword in text_lower for keyword in _SWAP_KEYWORDS) else None
+    
+    if match:
+        from_token = _TOKEN_MAP.get(match.group('from').lower())
+        to_token = _TOKEN_MAP.get(match.group('to').lower())
+    
+    # If no pattern matched, extract from found tokens
+    if not from_token and not to_token and len(found_tokens) >= 2:
+        from_token = found_tokens[0]
+        to_token = found_tokens[1]
+    
+    return {
+        'is_swap_request': bool(from_token and to_token),
+        'from_token': from_token,
+        'to_token': to_token,
+        'amount': amount
+    }
+
+@lru_cache(maxsize=1024)
+def _parse_transfer(message: str) -> dict:
+    """Extract transfer request from natural language message - supports bulk transfers"""
+    
+    # Patterns are lowercase, so normalize the message once
+    message_lower = message.lower()
+    
+    # Every transfer pattern needs a keyword and an address
+    if '0x' not in message_lower or not any(keyword in message_lower for keyword in _TRANSFER_KEYWORDS):
+        return _empty_transfer_request()
+    
+    # Check for bulk transfers first
+    for pattern in _BULK_TRANSFER_RES:
+        match = pattern.search(message_lower)
+        if match:
+            amount = float(match.group(1))
+            token = match.group(2).upper()
+            addresses_str = match.group(3)
+    
+            # Parse addresses from comma-separated string
+            addresses = []
+            for addr in addresses_str.split(','):
+                addr = addr.strip()
+                if _ADDR_RE.match(addr):
+                    addresses.append(addr)
+    
+            if len(addresses) > 1:  # Bulk transfer
+                return {
+                    'is_transfer_request': True,
+                    'is_bulk_transfer': True,
+                    'amount': amount,
+                    'token': token,
+                    'receivers': addresses,
+                    'receiver_count': len(addresses),
+                    'total_amount': amount * len(addresses)
+                }
+            elif len(addresses) == 1:  # Single transfer
                 return {
                     'is_transfer_request': True,
                     'is_bulk_transfer': False,
                     'amount': amount,
-                    'token': mapped_token,
-                    'receiver': receiver,
-                    'original_message': message
+                    'token': token,
+                    'receiver': addresses[0]
                 }
-        
-        return {
-            'is_transfer_request': False,
-            'amount': 0,
-            'token': None,
-            'receiver': None,
-            'original_message': message
-        }
+    
+    for pattern in _SINGLE_TRANSFER_RES:
+        match = pattern.search(message_lower)
+        if match:
+            amount = float(match.group(1))
+            token = match.group(2).upper()
+            receiver = match.group(3)
+    
+            return {
+                'is_transfer_request': True,
+                'is_bulk_transfer': False,
+                'amount': amount,
+                'token': token,
+                'receiver': receiver
+            }
+    
+    return _empty_transfer_request()
+
+def _empty_transfer_request() -> dict:
+    """Result for messages that are not transfer requests"""
+    return {
+        'is_transfer_request': False,
+        'amount': 0,
+        'token': None,
+        'receiver': None
+    }
+
+# Verify response formatting tables
+_VERIFY_SOURCE_NAMES = MappingProxyType({
+    'local_blacklist': 'Local Database',
+    'goplus_security': 'GoPlus Security',
+    'etherscamdb': 'EtherScamDB'
+})
+# Emoji the chat bullets drop - translate() works per code point, so multi-code-point
+# emoji (⚠️, 🕵️) are listed whole and their variation selector is stripped too
+_WARNING_EMOJI_STRIP = str.maketrans('', '', '🚨🍯⚠️📋✅')
+_RECOMMENDATION_EMOJI_STRIP = str.maketrans('', '', '🚨🔒📞🕵️⚠️🔍💰📋⚡✅💵🕒🔄📊')
+
+# Reply for signature-only sessions - the swap itself is signed in the browser
+_METAMASK_SIGNING_TEMPLATE = "🔐 **MetaMask İmzalama Gerekli**\n\n💱 **İşlem:** {amount} {from_token} → {to_token}\n\n📝 **Durum:** Cüzdanınız signature-only modda bağlı\n\n✅ **Sonraki adım:** MetaMask'ta işlemi onaylayın\n\n🔄 Frontend'te MetaMask popup'ı açılacak ve işlemi imzalamanız istenecek."
+
+# Route fields the swap success message shows, fetched in one call
+_ROUTE_SUMMARY_FIELDS = itemgetter('estimated_output', 'pools', 'gas_cost_usd')
+
+# Swap exceptions with a dedicated reply, checked in order (the pair tag is the more specific one)
+_UNSUPPORTED_PAIR_ERRORS = (
+    ('RISE_USDT_PAIR_NOT_SUPPORTED', MappingProxyType({
+        'type': 'error',
+        'message': "❌ **RISE → USDT Not Available**\n\n🚫 **Issue:** This trading pair is not supported on the current DEX\n\n💡 **Alternative Routes:**\n• RISE → ETH → USDT (2-step)\n• RISE → USDC → USDT (2-step)\n\n🔄 **Try:** Different token pairs with direct liquidity",
+        'show_retry': True,
+        'error_code': 'UNSUPPORTED_PAIR',
+        'can_retry': True
+    })),
+    ('RISE_USDT_NOT_SUPPORTED', MappingProxyType({
+        'type': 'error',
+        'message': "❌ **RISE → USDT Not Available**\n\n🚫 **Issue:** This swap pair is not supported\n\n💡 **Available Swaps:**\n• ETH → USDC/USDT/RISE\n• USDT → USDC\n\n🔄 **Try:** Use ETH to get RISE tokens, or swap USDT to USDC",
+        'show_retry': False,
+        'error_code': 'UNSUPPORTED_PAIR',
+        'can_retry': False
+    }))
+)
+
+class ChatAI:
+    """Stateless chat command router - messages are not persisted"""
+    
+    def parse_swap_request(self, message: str) -> dict:
+        """Extract swap request from natural language message"""
+        swap_request = dict(_parse_swap(message[:_MAX_SWAP_MESSAGE_LENGTH]))
+        swap_request['original_message'] = message
+        return swap_request
+    
+    def parse_transfer_request(self, message: str) -> dict:
+        """Extract transfer request from natural language message - supports bulk transfers"""
+        if len(message) <= _MAX_CACHED_TRANSFER_MESSAGE_LENGTH:
+            transfer_request = dict(_parse_transfer(message))
+        else:
+            transfer_request = _parse_transfer.__wrapped__(message)
+        transfer_request['original_message'] = message
+        return transfer_request
     
     def parse_verify_request(self, message: str) -> dict:
         """Extract verify request from message"""
         
-        # Verify patterns
-        verify_patterns = [
-            r'verify\s+(0x[a-fA-F0-9]{40})',  # verify 0x123...
-            r'check\s+(0x[a-fA-F0-9]{40})',   # check 0x123...
-            r'analyze\s+(0x[a-fA-F0-9]{40})', # analyze 0x123...
-            r'güvenlik\s+(0x[a-fA-F0-9]{40})', # Turkish: güvenlik 0x123...
-            r'kontrol\s+(0x[a-fA-F0-9]{40})'  # Turkish: kontrol 0x123...
-        ]
-        
-        for pattern in verify_patterns:
-            match = re.search(pattern, message, re.IGNORECASE)
+        for pattern in _VERIFY_RES:
+            match = pattern.search(message)
             if match:
                 address = match.group(1)
                 return {
@@ -340,49 +612,38 @@ class ChatAI:
             'original_message': message
         }
     
-    def handle_verify_request(self, verify_request: dict) -> dict:
+    def handle_verify_request(self, verify_request: dict, now_iso: str = None) -> dict:
         """Handle address verification request"""
         
         address = verify_request['address']
         
+        # Recently verified addresses are answered from the detector's cache, without an event loop
+        cached_analysis = phishing_detector.get_cached_result(address)
+        if cached_analysis is not None:
+            return self.format_verify_response(cached_analysis, now_iso)
+        
         try:
-            # Async verification'ı sync wrapper ile çalıştır
-            import asyncio
-            
-            # Event loop kontrolü
+            # Async verification'ı arka plandaki kalıcı event loop'ta çalıştır
+            future = asyncio.run_coroutine_threadsafe(_verify_single_flight(address), _verify_loop)
             try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # Eğer loop zaten çalışıyorsa, thread pool kullan
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, phishing_detector.verify_address(address))
-                        analysis = future.result(timeout=30)
-                else:
-                    # Loop çalışmıyorsa direkt çalıştır
-                    analysis = asyncio.run(phishing_detector.verify_address(address))
-            except RuntimeError:
-                # Fallback: yeni event loop oluştur
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    analysis = loop.run_until_complete(phishing_detector.verify_address(address))
-                finally:
-                    loop.close()
+                analysis = future.result(timeout=30)
+            except Exception:
+                future.cancel()
+                raise
             
             # Sonucu formatla
-            return self.format_verify_response(analysis)
+            return self.format_verify_response(analysis, now_iso)
             
         except Exception as e:
-            print(f"🚨 Verify error: {str(e)}")
+            logger.warning("Verify error: %s", e)
             return {
                 'type': 'verify_error',
                 'message': f"❌ **Verification Failed**\n\n🔍 **Address:** `{address}`\n\n⚠️ **Error:** {str(e)}\n\n💡 **Try again in a few moments**",
                 'can_retry': True,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso or datetime.now().isoformat()
             }
     
-    def format_verify_response(self, analysis: dict) -> dict:
+    def format_verify_response(self, analysis: dict, now_iso: str = None) -> dict:
         """Format verification response for chat"""
         
         address = analysis['address']
@@ -408,40 +669,40 @@ class ChatAI:
                 safety_emoji = "⚠️" if risk_score < 60 else "🚨"
                 safety_status = "RISKY"
             
-            message = f"🛡️ **ADDRESS VERIFICATION COMPLETE**\n\n"
-            message += f"🔍 Address: `{address[:10]}...{address[-8:]}`\n"
-            message += f"{safety_emoji} Status: {safety_status}\n"
-            message += f"📊 Risk Score: {risk_score:.0f}/100\n"
-            message += f"📈 Risk Level: {risk_level.upper()}\n\n"
+            # Collect the pieces and join once at the end
+            parts = [
+                "🛡️ **ADDRESS VERIFICATION COMPLETE**\n\n",
+                f"🔍 Address: `{address[:10]}...{address[-8:]}`\n",
+                f"{safety_emoji} Status: {safety_status}\n",
+                f"📊 Risk Score: {risk_score:.0f}/100\n",
+                f"📈 Risk Level: {risk_level.upper()}\n\n"
+            ]
             
             # Sources
             if sources:
-                source_names = {
-                    'local_blacklist': 'Local Database',
-                    'goplus_security': 'GoPlus Security',
-                    'etherscamdb': 'EtherScamDB'
-                }
-                checked_sources = [source_names.get(s, s) for s in sources]
-                message += f"🔍 Sources Checked: {', '.join(checked_sources)}\n\n"
+                checked_sources = [_VERIFY_SOURCE_NAMES.get(s, s) for s in sources]
+                parts.append(f"🔍 Sources Checked: {', '.join(checked_sources)}\n\n")
             
             # Warnings
             if warnings:
-                message += "⚠️ **SECURITY WARNINGS:**\n"
+                parts.append("⚠️ **SECURITY WARNINGS:**\n")
                 for warning in warnings[:3]:  # İlk 3 warning
-                    clean_warning = warning.replace('🚨', '').replace('🍯', '').replace('⚠️', '').replace('📋', '').replace('✅', '').strip()
-                    message += f"• {clean_warning}\n"
+                    clean_warning = warning.translate(_WARNING_EMOJI_STRIP).strip()
+                    parts.append(f"• {clean_warning}\n")
                 if len(warnings) > 3:
-                    message += f"• ... and {len(warnings) - 3} more warnings\n"
-                message += "\n"
+                    parts.append(f"• ... and {len(warnings) - 3} more warnings\n")
+                parts.append("\n")
             
             # Recommendations
             if recommendations:
-                message += "💡 **RECOMMENDATIONS:**\n"
+                parts.append("💡 **RECOMMENDATIONS:**\n")
                 for rec in recommendations[:3]:  # İlk 3 recommendation
-                    clean_rec = rec.replace('🚨', '').replace('🔒', '').replace('📞', '').replace('🕵️', '').replace('⚠️', '').replace('🔍', '').replace('💰', '').replace('📋', '').replace('⚡', '').replace('✅', '').replace('💵', '').replace('🕒', '').replace('🔄', '').replace('📊', '').strip()
-                    message += f"• {clean_rec}\n"
+                    clean_rec = rec.translate(_RECOMMENDATION_EMOJI_STRIP).strip()
+                    parts.append(f"• {clean_rec}\n")
                 if len(recommendations) > 3:
-                    message += f"• ... and {len(recommendations) - 3} more recommendations\n"
+                    parts.append(f"• ... and {len(recommendations) - 3} more recommendations\n")
+            
+            message = "".join(parts)
         
         return {
             'type': 'address_verification',
@@ -451,69 +712,73 @@ class ChatAI:
             'risk_level': risk_level,
             'risk_score': risk_score,
             'can_retry': risk_level in ['error'],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso or datetime.now().isoformat()
         }
     
-    def process_message(self, message: str, user_address: str = None, session_info: dict = None, has_metamask_auth: bool = False) -> dict:
+    def process_message(self, message: str, user_address: str = None, session_info: dict = None, has_metamask_auth: bool = False, now_iso: str = None) -> dict:
         """Process chat message and generate response"""
         
+        # One timestamp for the whole request, shared by all responses
+        now_iso = now_iso or datetime.now().isoformat()
         
-        # Add message to conversation history
-        self.conversation_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'user_message': message,
-            'user_address': user_address
-        })
+        # Work out which command parsers can match at all - one pass over the message
+        intents = {match.lastgroup for match in _INTENT_RE.finditer(message)}
+        if '0x' not in message.lower():
+            intents -= _ADDRESS_INTENTS
         
         # Check for verify command first
-        verify_request = self.parse_verify_request(message)
-        if verify_request['is_verify_request']:
-            return self.handle_verify_request(verify_request)
+        if 'verify' in intents:
+            verify_request = self.parse_verify_request(message)
+            if verify_request['is_verify_request']:
+                return self.handle_verify_request(verify_request, now_iso)
         
         # First check for transfer request
-        transfer_request = self.parse_transfer_request(message)
-        if transfer_request['is_transfer_request']:
-            return self.handle_transfer_request(transfer_request, user_address)
-        
-        # Then check for swap request
-        swap_request = self.parse_swap_request(message)
-        
-        if swap_request['is_swap_request']:
-            return self.handle_swap_request(swap_request, user_address, session_info, has_metamask_auth)
+        if 'transfer' in intents:
+            transfer_request = self.parse_transfer_request(message)
+            if transfer_request['is_transfer_request']:
+                return self.handle_transfer_request(transfer_request, user_address, now_iso)
+        
+        # Then check for swap request - only if the message mentions a token at all
+        if 'swap' in intents:
+            swap_request = self.parse_swap_request(message)
+            
+            if swap_request['is_swap_request']:
+                return self.handle_swap_request(swap_request, user_address, session_info, has_metamask_auth, now_iso)
         
         # Handle as general message
         return self.handle_general_message(message)
     
-    def handle_transfer_request(self, transfer_request: dict, user_address: str) -> dict:
+    def handle_transfer_request(self, transfer_request: dict, user_address: str, now_iso: str = None) -> dict:
         """Handle transfer request with comprehensive error handling - supports bulk transfers"""
         
-        print(f"🐛 DEBUG: handle_transfer_request called with: {transfer_request}")  # Debug log
+        logger.debug("handle_transfer_request called with: %s", transfer_request)
         
         # Check if this is a bulk transfer
         is_bulk = transfer_request.get('is_bulk_transfer', False)
         
         if is_bulk:
-            return self.handle_bulk_transfer_request(transfer_request, user_address)
+            return self.handle_bulk_transfer_request(transfer_request, user_address, now_iso)
         
         # Handle single transfer (existing logic)
         amount = transfer_request['amount']
         token = transfer_request['token']
         receiver = transfer_request['receiver']
         
-        print(f"🐛 DEBUG: Transfer params - Amount: {amount}, Token: {token}, Receiver: {receiver}")  # Debug log
+        logger.debug("Transfer params - Amount: %s, Token: %s, Receiver: %s", amount, token, receiver)
         
         # Input validation
         if amount <= 0:
-            return self.error_handler.get_error_response('INVALID_AMOUNT')
+            return SwapErrorHandler.get_error_response('INVALID_AMOUNT', now_iso=now_iso)
         
-        if not receiver or len(receiver) != 42 or not receiver.startswith('0x'):
-            return self.error_handler.get_error_response(
+        if not receiver or not _ADDR_RE.match(receiver):
+            return SwapErrorHandler.get_error_response(
                 'GENERIC_ERROR',
-                '❌ **Invalid Receiver Address**\n\n🔗 Please provide a valid Ethereum address.\n\n💡 **Format:** 0x followed by 40 characters\n\n🔄 **Example:** send 0.1 eth 0x742d35Cc6634C0532925a3b8D5C2d3b5c5b5b5b5'
+                '❌ **Invalid Receiver Address**\n\n🔗 Please provide a valid Ethereum address.\n\n💡 **Format:** 0x followed by 40 characters\n\n🔄 **Example:** send 0.1 eth 0x742d35Cc6634C0532925a3b8D5C2d3b5c5b5b5b5',
+                now_iso=now_iso
             )
         
-        if token not in ['ETH', 'WETH', 'USDT', 'USDC', 'RISE']:
-            return self.error_handler.get_error_response('UNSUPPORTED_TOKEN')
+        if token not in _SUPPORTED_TOKENS:
+            return SwapErrorHandler.get_error_response('UNSUPPORTED_TOKEN', now_iso=now_iso)
         
         try:
             # Execute transfer transaction
@@ -529,21 +794,22 @@ class ChatAI:
                     'can_retry': False
                 }
             else:
-                error_type = self.error_handler.classify_error(tx_result.get('error', ''))
-                return self.error_handler.get_error_response(
+                error_type = SwapErrorHandler.classify_error(tx_result.get('error', ''))
+                return SwapErrorHandler.get_error_response(
                     error_type,
-                    tx_hash=tx_result.get('tx_hash')
+                    tx_hash=tx_result.get('tx_hash'),
+                    now_iso=now_iso
                 )
                 
         except Exception as e:
-            print(f"🐛 DEBUG: Exception in handle_transfer_request: {str(e)}")  # Debug log
-            error_type = self.error_handler.classify_error(str(e), e)
-            return self.error_handler.get_error_response(error_type)
+            logger.debug("Exception in handle_transfer_request: %s", e)
+            error_type = SwapErrorHandler.classify_error(str(e), e)
+            return SwapErrorHandler.get_error_response(error_type, now_iso=now_iso)
     
-    def handle_bulk_transfer_request(self, transfer_request: dict, user_address: str) -> dict:
+    def handle_bulk_transfer_request(self, transfer_request: dict, user_address: str, now_iso: str = None) -> dict:
         """Handle bulk transfer request - send same amount to multiple addresses"""
         
-        print(f"🐛 DEBUG: handle_bulk_transfer_request called with: {transfer_request}")  # Debug log
+        logger.debug("handle_bulk_transfer_request called with: %s", transfer_request)
         
         amount = transfer_request['amount']
         token = transfer_request['token']
@@ -551,74 +817,79 @@ class ChatAI:
         receiver_count = transfer_request['receiver_count']
         total_amount = transfer_request['total_amount']
         
-        print(f"🐛 DEBUG: Bulk Transfer params - Amount per address: {amount}, Token: {token}, Receivers: {len(receivers)}, Total: {total_amount}")
+        logger.debug("Bulk Transfer params - Amount per address: %s, Token: %s, Receivers: %s, Total: %s", amount, token, len(receivers), total_amount)
         
         # Input validation
         if amount <= 0:
-            return self.error_handler.get_error_response('INVALID_AMOUNT')
+            return SwapErrorHandler.get_error_response('INVALID_AMOUNT', now_iso=now_iso)
         
         if receiver_count > 20:  # Limit bulk transfers to 20 addresses
-            return self.error_handler.get_error_response(
+            return SwapErrorHandler.get_error_response(
                 'GENERIC_ERROR',
-                '❌ **Too Many Addresses**\n\n🚫 Maximum 20 addresses allowed for bulk transfer\n\n💡 **Current:** {} addresses\n\n🔄 **Please split into smaller batches**'.format(receiver_count)
+                '❌ **Too Many Addresses**\n\n🚫 Maximum 20 addresses allowed for bulk transfer\n\n💡 **Current:** {} addresses\n\n🔄 **Please split into smaller batches**'.format(receiver_count),
+                now_iso=now_iso
             )
         
-        if token not in ['ETH', 'WETH', 'USDT', 'USDC', 'RISE']:
-            return self.error_handler.get_error_response('UNSUPPORTED_TOKEN')
+        if token not in _SUPPORTED_TOKENS:
+            return SwapErrorHandler.get_error_response('UNSUPPORTED_TOKEN', now_iso=now_iso)
         
-        # Validate all addresses
-        invalid_addresses = []
-        for addr in receivers:
-            if not addr or len(addr) != 42 or not addr.startswith('0x'):
-                invalid_addresses.append(addr)
+        # Validate all addresses (same check as single transfers)
+        invalid_addresses = [addr for addr in receivers if not addr or not _ADDR_RE.match(addr)]
         
         if invalid_addresses:
-            return self.error_handler.get_error_response(
+            return SwapErrorHandler.get_error_response(
                 'GENERIC_ERROR',
-                '❌ **Invalid Addresses Found**\n\n🔗 Invalid addresses: {}\n\n💡 **Format:** 0x followed by 40 characters'.format(', '.join(invalid_addresses))
+                '❌ **Invalid Addresses Found**\n\n🔗 Invalid addresses: {}\n\n💡 **Format:** 0x followed by 40 characters'.format(', '.join(invalid_addresses)),
+                now_iso=now_iso
             )
         
         try:
             # Execute bulk transfer transactions
             results = []
-            successful_transfers = 0
-            failed_transfers = 0
+            successful_results = []
+            failed_results = []
             total_gas_used = 0
             
-            for i, receiver in enumerate(receivers):
-                print(f"🐛 DEBUG: Processing transfer {i+1}/{len(receivers)} to {receiver}")
-                
-                tx_result = self.execute_transfer_transaction(amount, token, receiver, user_address)
-                
+            # All transfers are signed and broadcast together, then their receipts collected
+            tx_results = self.execute_bulk_transfer_transaction(amount, token, receivers, user_address)
+            
+            # One pass: every result lands in `results` (request order) and in its outcome list
+            for receiver, tx_result in zip(receivers, tx_results):
                 if tx_result['success']:
-                    successful_transfers += 1
                     total_gas_used += tx_result.get('gas_used', 0)
-                    results.append({
+                    result = {
                         'address': receiver,
                         'success': True,
                         'tx_hash': tx_result['tx_hash'],
                         'gas_used': tx_result.get('gas_used', 0)
-                    })
+                    }
+                    successful_results.append(result)
                 else:
-                    failed_transfers += 1
-                    results.append({
+                    result = {
                         'address': receiver,
                         'success': False,
                         'error': tx_result.get('error', 'Unknown error')
-                    })
+                    }
+                    failed_results.append(result)
+                results.append(result)
+            
+            successful_transfers = len(successful_results)
+            failed_transfers = len(failed_results)
             
             # Build response message
             if successful_transfers == receiver_count:
                 # All transfers successful
-                message = f"✅ **Bulk Transfer Completed!**\n\n💸 **Sent:** {amount} {token} each to {receiver_count} addresses\n\n📊 **Total Amount:** {total_amount} {token}\n\n✅ **Successful:** {successful_transfers}/{receiver_count}\n\n⛽ **Total Gas:** {total_gas_used} units"
+                parts = [
+                    f"✅ **Bulk Transfer Completed!**\n\n💸 **Sent:** {amount} {token} each to {receiver_count} addresses\n\n📊 **Total Amount:** {total_amount} {token}\n\n✅ **Successful:** {successful_transfers}/{receiver_count}\n\n⛽ **Total Gas:** {total_gas_used} units",
+                    "\n\n🔗 **Transaction Hashes:**\n"
+                ]
                 
                 # Add transaction hashes
-                message += "\n\n🔗 **Transaction Hashes:**\n"
-                for result in results[:5]:  # Show first 5 tx hashes
-                    message += f"• `{result['tx_hash']}`\n"
+                parts.extend(f"• `{result['tx_hash']}`\n" for result in results[:5])  # Show first 5 tx hashes
                 
                 if len(results) > 5:
-                    message += f"• ... and {len(results) - 5} more transactions"
+                    parts.append(f"• ... and {len(results) - 5} more transactions")
+                message = "".join(parts)
                 
                 return {
                     'type': 'bulk_transfer_success',
@@ -634,14 +905,13 @@ class ChatAI:
             
             elif successful_transfers > 0:
                 # Partial success
-                message = f"⚠️ **Bulk Transfer Partially Completed**\n\n💸 **Amount per address:** {amount} {token}\n\n📊 **Results:**\n✅ **Successful:** {successful_transfers}/{receiver_count}\n❌ **Failed:** {failed_transfers}/{receiver_count}\n\n⛽ **Gas Used:** {total_gas_used} units"
+                parts = [f"⚠️ **Bulk Transfer Partially Completed**\n\n💸 **Amount per address:** {amount} {token}\n\n📊 **Results:**\n✅ **Successful:** {successful_transfers}/{receiver_count}\n❌ **Failed:** {failed_transfers}/{receiver_count}\n\n⛽ **Gas Used:** {total_gas_used} units"]
                 
                 # Show successful transactions
-                successful_results = [r for r in results if r['success']]
                 if successful_results:
-                    message += "\n\n🔗 **Successful Transfers:**\n"
-                    for result in successful_results[:3]:
-                        message += f"• `{result['tx_hash']}` → {result['address'][:10]}...\n"
+                    parts.append("\n\n🔗 **Successful Transfers:**\n")
+                    parts.extend(f"• `{result['tx_hash']}` → {result['address'][:10]}...\n" for result in successful_results[:3])
+                message = "".join(parts)
                 
                 return {
                     'type': 'bulk_transfer_partial',
@@ -660,22 +930,23 @@ class ChatAI:
                 message = f"❌ **Bulk Transfer Failed**\n\n💸 **Attempted:** {amount} {token} to {receiver_count} addresses\n\n📊 **All {receiver_count} transfers failed**"
                 
                 # Show first few errors
-                message += "\n\n🚨 **Sample Errors:**\n"
-                for result in results[:3]:
-                    if not result['success']:
-                        message += f"• {result['address'][:10]}...: {result['error'][:50]}...\n"
+                message += "\n\n🚨 **Sample Errors:**\n" + "".join(
+                    f"• {result['address'][:10]}...: {result['error'][:50]}...\n"
+                    for result in results[:3] if not result['success']
+                )
                 
-                return self.error_handler.get_error_response(
+                return SwapErrorHandler.get_error_response(
                     'GENERIC_ERROR',
-                    message
+                    message,
+                    now_iso=now_iso
                 )
                 
         except Exception as e:
-            print(f"🐛 DEBUG: Exception in handle_bulk_transfer_request: {str(e)}")
-            error_type = self.error_handler.classify_error(str(e), e)
-            return self.error_handler.get_error_response(error_type)
+            logger.debug("Exception in handle_bulk_transfer_request: %s", e)
+            error_type = SwapErrorHandler.classify_error(str(e), e)
+            return SwapErrorHandler.get_error_response(error_type, now_iso=now_iso)
     
-    def handle_swap_request(self, swap_request: dict, user_address: str, session_info: dict = None, has_metamask_auth: bool = False) -> dict:
+    def handle_swap_request(self, swap_request: dict, user_address: str, session_info: dict = None, has_metamask_auth: bool = False, now_iso: str = None) -> dict:
         """Handle swap request with comprehensive error handling and approval support"""
         
         from_token = swap_request['from_token']
@@ -684,48 +955,43 @@ class ChatAI:
         
         # Input validation
         if not from_token or not to_token:
-            return self.error_handler.get_error_response('UNSUPPORTED_TOKEN')
+            return SwapErrorHandler.get_error_response('UNSUPPORTED_TOKEN', now_iso=now_iso)
         
         if amount <= 0:
-            return self.error_handler.get_error_response('INVALID_AMOUNT')
+            return SwapErrorHandler.get_error_response('INVALID_AMOUNT', now_iso=now_iso)
         
         # Check if this is a signature-only session (MetaMask signing required)
         if session_info and session_info.get('method') == 'signature' and not session_info.get('has_private_key') and not has_metamask_auth:
             return {
                 'type': 'metamask_signing_required',
-                'message': f"🔐 **MetaMask İmzalama Gerekli**\n\n💱 **İşlem:** {amount} {from_token} → {to_token}\n\n📝 **Durum:** Cüzdanınız signature-only modda bağlı\n\n✅ **Sonraki adım:** MetaMask'ta işlemi onaylayın\n\n🔄 Frontend'te MetaMask popup'ı açılacak ve işlemi imzalamanız istenecek.",
+                'message': _METAMASK_SIGNING_TEMPLATE.format(amount=amount, from_token=from_token, to_token=to_token),
                 'swap_details': {
                     'from_token': from_token,
                     'to_token': to_token,
                     'amount': amount
                 },
                 'requires_metamask': True,
-                'session_id': session_info.get('session_id') if session_info else None,
+                'session_id': session_info.get('session_id'),
                 'can_retry': False
             }
         
         # If MetaMask authentication is provided, simulate successful swap
         if has_metamask_auth:
-            print(f"🔐 Processing swap with MetaMask authentication: {amount} {from_token} → {to_token}")
+            logger.debug("Processing swap with MetaMask authentication: %s %s → %s", amount, from_token, to_token)
             
             # Simulate successful transaction (in production, this would be a real MetaMask transaction)
-            import time
-            import random
-            
             # Generate a simulated transaction hash
-            simulated_tx_hash = f"0x{random.randint(10**63, 10**64-1):064x}"
-            
-            # Simulate processing time
-            time.sleep(1)
+            simulated_tx_hash = "0x" + secrets.token_hex(32)
+            explorer_url = EXPLORER_TX_URL.format(simulated_tx_hash)
             
             # Calculate estimated output based on current rates
             estimated_output = amount * 3000 * 0.997  # 1 ETH ≈ 3000 USDT, 0.3% fee
             
             return {
                 'type': 'swap_success',
-                'message': f"✅ **MetaMask Swap Başarılı!**\n\n💰 **İşlem:** {amount} {from_token} → {estimated_output:.4f} {to_token}\n\n🔐 **MetaMask ile onaylandı**\n\n🔗 **Transaction Hash:** `{simulated_tx_hash}`\n\n📊 **Explorer:** [View Transaction](https://explorer.testnet.riselabs.xyz/tx/{simulated_tx_hash})\n\n⚡ **Gerçek MetaMask entegrasyonu aktif!**",
+                'message': f"✅ **MetaMask Swap Başarılı!**\n\n💰 **İşlem:** {amount} {from_token} → {estimated_output:.4f} {to_token}\n\n🔐 **MetaMask ile onaylandı**\n\n🔗 **Transaction Hash:** `{simulated_tx_hash}`\n\n📊 **Explorer:** [View Transaction]({explorer_url})\n\n⚡ **Gerçek MetaMask entegrasyonu aktif!**",
                 'tx_hash': simulated_tx_hash,
-                'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{simulated_tx_hash}",
+                'explorer_url': explorer_url,
                 'show_explorer_link': True,
                 'can_retry': False,
                 'estimated_amount_out': estimated_output,
@@ -733,43 +999,47 @@ class ChatAI:
             }
         
         try:
-            print(f"🔍 DEBUG: Starting swap - {amount} {from_token} → {to_token}")
+            logger.debug("Starting swap - %s %s → %s", amount, from_token, to_token)
             
             # Find best route with error handling
             route_result = swap_agent.find_best_swap_route(from_token, to_token, amount)
-            print(f"🔍 DEBUG: Route result: {route_result}")
+            logger.debug("Route result: %s", route_result)
             
             if not route_result.get('success'):
-                print(f"🔍 DEBUG: Route finding failed: {route_result.get('error', 'Unknown error')}")
-                error_type = self.error_handler.classify_error(route_result.get('error', ''))
-                return self.error_handler.get_error_response(
+                logger.debug("Route finding failed: %s", route_result.get('error', 'Unknown error'))
+                error_type = SwapErrorHandler.classify_error(route_result.get('error', ''))
+                return SwapErrorHandler.get_error_response(
                     error_type, 
-                    f"❌ **Route Finding Failed**\n\n🔍 **Error:** {route_result.get('error', 'Unknown error')}\n\n💡 **Supported tokens:** ETH, USDC, USDT, RISE\n\n🔄 **Try:** Different token pairs or amounts"
+                    f"❌ **Route Finding Failed**\n\n🔍 **Error:** {route_result.get('error', 'Unknown error')}\n\n💡 **Supported tokens:** ETH, USDC, USDT, RISE\n\n🔄 **Try:** Different token pairs or amounts",
+                    now_iso=now_iso
                 )
             
             # Determine if we need approval (token-to-token swaps)
-            needs_approval = from_token not in ['ETH', 'WETH']
-            print(f"🔍 DEBUG: Needs approval: {needs_approval}")
+            needs_approval = from_token not in _NATIVE_TOKENS
+            logger.debug("Needs approval: %s", needs_approval)
             
             if needs_approval:
-                print(f"🔍 DEBUG: Executing two-step swap")
+                logger.debug("Executing two-step swap")
                 # Execute two-step swap (approval + swap)
                 tx_result = self.execute_two_step_swap_transaction(from_token, to_token, amount, user_address)
             else:
-                print(f"🔍 DEBUG: Executing single-step swap")
+                logger.debug("Executing single-step swap")
                 # Execute single-step swap (ETH to token)
                 tx_result = self.execute_swap_transaction(from_token, to_token, amount, user_address)
             
-            print(f"🔍 DEBUG: Transaction result: {tx_result}")
+            logger.debug("Transaction result: %s", tx_result)
             
             if tx_result['success']:
                 # Build success message
+                route_details = route_result['route_details']
+                estimated_output, pools, gas_cost_usd = _ROUTE_SUMMARY_FIELDS(route_details)
+                route_str = ' → '.join(pools)
                 if needs_approval and 'approval_tx_hash' in tx_result:
-                    message = f"✅ **Two-Step Swap Successful!**\n\n💰 **Trade:** {amount} {from_token} → {route_result['route_details']['estimated_output']:.4f} {to_token}\n\n🛣️ **Route:** {' → '.join(route_result['route_details']['pools'])}\n\n🔐 **Step 1 - Approval:** `{tx_result['approval_tx_hash']}`\n🔄 **Step 2 - Swap:** `{tx_result['swap_tx_hash']}`\n\n⛽ **Total Gas Cost:** ${route_result['route_details']['gas_cost_usd']:.2f}"
+                    message = f"✅ **Two-Step Swap Successful!**\n\n💰 **Trade:** {amount} {from_token} → {estimated_output:.4f} {to_token}\n\n🛣️ **Route:** {route_str}\n\n🔐 **Step 1 - Approval:** `{tx_result['approval_tx_hash']}`\n🔄 **Step 2 - Swap:** `{tx_result['swap_tx_hash']}`\n\n⛽ **Total Gas Cost:** ${gas_cost_usd:.2f}"
                     tx_hash = tx_result['swap_tx_hash']
                     explorer_url = tx_result.get('explorer_url')
                 else:
-                    message = f"✅ **Swap Successful!**\n\n💰 **Trade:** {amount} {from_token} → {route_result['route_details']['estimated_output']:.4f} {to_token}\n\n🛣️ **Route:** {' → '.join(route_result['route_details']['pools'])}\n\n⛽ **Gas Cost:** ${route_result['route_details']['gas_cost_usd']:.2f}\n\n🔗 **Transaction Hash:** `{tx_result['tx_hash']}`"
+                    message = f"✅ **Swap Successful!**\n\n💰 **Trade:** {amount} {from_token} → {estimated_output:.4f} {to_token}\n\n🛣️ **Route:** {route_str}\n\n⛽ **Gas Cost:** ${gas_cost_usd:.2f}\n\n🔗 **Transaction Hash:** `{tx_result['tx_hash']}`"
                     tx_hash = tx_result['tx_hash']
                     explorer_url = tx_result.get('explorer_url')
                 
@@ -778,7 +1048,7 @@ class ChatAI:
                     'message': message,
                     'tx_hash': tx_hash,
                     'explorer_url': explorer_url,
-                    'route_details': route_result['route_details'],
+                    'route_details': route_details,
                     'show_explorer_link': True,
                     'can_retry': False,
                     'approval_tx_hash': tx_result.get('approval_tx_hash'),
@@ -786,66 +1056,40 @@ class ChatAI:
                     'steps': tx_result.get('steps', ['swap'])
                 }
             else:
-                error_type = self.error_handler.classify_error(tx_result.get('error', ''))
-                return self.error_handler.get_error_response(
+                error_type = SwapErrorHandler.classify_error(tx_result.get('error', ''))
+                return SwapErrorHandler.get_error_response(
                     error_type,
-                    tx_hash=tx_result.get('tx_hash')
+                    tx_hash=tx_result.get('tx_hash'),
+                    now_iso=now_iso
                 )
                 
         except Exception as e:
-            print(f"🐛 DEBUG: Exception in handle_swap_request: {str(e)}")
-            print(f"🐛 DEBUG: Exception type: {type(e)}")
-            import traceback
-            print(f"🐛 DEBUG: Full traceback: {traceback.format_exc()}")
+            logger.debug("Exception in handle_swap_request: %s", e)
+            logger.debug("Exception type: %s", type(e))
+            logger.debug("Full traceback", exc_info=True)
             
             # Handle specific RISE→USDT pair not supported error BEFORE generic classification
-            if 'RISE_USDT_PAIR_NOT_SUPPORTED' in str(e):
-                return {
-                    'type': 'error',
-                    'message': f"❌ **RISE → USDT Not Available**\n\n🚫 **Issue:** This trading pair is not supported on the current DEX\n\n💡 **Alternative Routes:**\n• RISE → ETH → USDT (2-step)\n• RISE → USDC → USDT (2-step)\n\n🔄 **Try:** Different token pairs with direct liquidity",
-                    'show_retry': True,
-                    'error_code': 'UNSUPPORTED_PAIR',
-                    'can_retry': True,
-                    'timestamp': datetime.now().isoformat()
-                }
-            
-            elif 'RISE_USDT_NOT_SUPPORTED' in str(e):
-                return {
-                    'type': 'error',
-                    'message': f"❌ **RISE → USDT Not Available**\n\n🚫 **Issue:** This swap pair is not supported\n\n💡 **Available Swaps:**\n• ETH → USDC/USDT/RISE\n• USDT → USDC\n\n🔄 **Try:** Use ETH to get RISE tokens, or swap USDT to USDC",
-                    'show_retry': False,
-                    'error_code': 'UNSUPPORTED_PAIR',
-                    'can_retry': False,
-                    'timestamp': datetime.now().isoformat()
-                }
+            error_text = str(e)
+            for tag, template in _UNSUPPORTED_PAIR_ERRORS:
+                if tag in error_text:
+                    response = dict(template)
+                    response['timestamp'] = now_iso or datetime.now().isoformat()
+                    return response
             
             # Return detailed error instead of generic classification
             return {
                 'type': 'swap_error',
-                'message': f"❌ **Debug Error**\n\n🔧 Error: {str(e)}\n\n💡 **Error Type:** {type(e).__name__}\n\n🔄 **Click \"Try Again\" to retry this operation**",
+                'message': f"❌ **Debug Error**\n\n🔧 Error: {error_text}\n\n💡 **Error Type:** {type(e).__name__}\n\n🔄 **Click \"Try Again\" to retry this operation**",
                 'can_retry': True,
-                'error_details': str(e),
+                'error_details': error_text,
                 'error_type': type(e).__name__,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso or datetime.now().isoformat()
             }
     
     def execute_swap_transaction(self, from_token: str, to_token: str, amount: float, user_address: str) -> dict:
         """Execute blockchain transaction with real wallet manager"""
         
         try:
-            # Ensure wallet is connected before executing swap
-            if not wallet_manager.connected_wallet:
-                # Get private key from environment
-                simulated_private_key = os.getenv('DEMO_PRIVATE_KEY')
-                
-                # Connect wallet manager
-                wallet_result = wallet_manager.connect_with_private_key(simulated_private_key)
-                if not wallet_result['success']:
-                    return {
-                        'success': False,
-                        'error': f'Wallet connection failed: {wallet_result.get("error", "Unknown error")}'
-                    }
-            
             # Execute real transaction with wallet manager
             result = wallet_manager.execute_swap_transaction(
                 from_token=from_token,
@@ -856,7 +1100,7 @@ class ChatAI:
             
             if result['success']:
                 # Generate RISE Explorer URL
-                explorer_url = f"https://explorer.testnet.riselabs.xyz/tx/{result['tx_hash']}"
+                explorer_url = EXPLORER_TX_URL.format(result['tx_hash'])
                 
                 return {
                     'success': True,
@@ -869,7 +1113,7 @@ class ChatAI:
                 return result
                 
         except Exception as e:
-            print(f"🐛 DEBUG: Exception in execute_swap_transaction: {str(e)}")  # Debug log
+            logger.debug("Exception in execute_swap_transaction: %s", e)
             return {
                 'success': False,
                 'error': 'Blockchain connection error',
@@ -880,19 +1124,6 @@ class ChatAI:
         """Execute two-step swap transaction: approval + swap"""
         
         try:
-            # Ensure wallet is connected before executing swap
-            if not wallet_manager.connected_wallet:
-                # Get private key from environment
-                simulated_private_key = os.getenv('DEMO_PRIVATE_KEY')
-                
-                # Connect wallet manager
-                wallet_result = wallet_manager.connect_with_private_key(simulated_private_key)
-                if not wallet_result['success']:
-                    return {
-                        'success': False,
-                        'error': f'Wallet connection failed: {wallet_result.get("error", "Unknown error")}'
-                    }
-            
             # Execute two-step swap with wallet manager
             result = wallet_manager.execute_two_step_swap(
                 from_token=from_token,
@@ -922,10 +1153,42 @@ class ChatAI:
                 'suggestion': f'System error: {str(e)}'
             }
     
+    def execute_bulk_transfer_transaction(self, amount: float, token: str, receivers: List[str], user_address: str) -> List[dict]:
+        """Execute a batch of transfers with real wallet manager - one result per receiver"""
+        
+        logger.debug("execute_bulk_transfer_transaction called - Amount: %s, Token: %s, Receivers: %s", amount, token, len(receivers))
+        
+        try:
+            transfer_results = wallet_manager.execute_bulk_transfer(amount=amount, token=token, receivers=receivers)
+        except Exception as e:
+            logger.debug("Exception in execute_bulk_transfer_transaction: %s", e)
+            return [{
+                'success': False,
+                'error': 'Transfer transaction error',
+                'suggestion': f'System error: {str(e)}'
+            } for _ in receivers]
+        
+        results = []
+        for result in transfer_results:
+            if not result['success']:
+                results.append(result)
+                continue
+            
+            # wallet_manager already returns 0x-prefixed hashes
+            tx_hash = result['tx_hash']
+            results.append({
+                'success': True,
+                'tx_hash': tx_hash,
+                'explorer_url': EXPLORER_TX_URL.format(tx_hash),
+                'block_number': result.get('block_number'),
+                'gas_used': result.get('gas_used', 0)
+            })
+        return results
+    
     def execute_transfer_transaction(self, amount: float, token: str, receiver: str, user_address: str) -> dict:
         """Execute transfer transaction with real wallet manager"""
         
-        print(f"🐛 DEBUG: execute_transfer_transaction called - Amount: {amount}, Token: {token}, Receiver: {receiver}")  # Debug log
+        logger.debug("execute_transfer_transaction called - Amount: %s, Token: %s, Receiver: %s", amount, token, receiver)
         
         try:
             # Execute real transfer with wallet manager
@@ -935,16 +1198,12 @@ class ChatAI:
                 receiver=receiver
             )
             
-            print(f"🐛 DEBUG: wallet_manager.execute_transfer_transaction result: {result}")  # Debug log
+            logger.debug("wallet_manager.execute_transfer_transaction result: %s", result)
             
             if result['success']:
-                # Ensure tx_hash has 0x prefix
+                # wallet_manager already returns 0x-prefixed hashes
                 tx_hash = result['tx_hash']
-                if not tx_hash.startswith('0x'):
-                    tx_hash = '0x' + tx_hash
-                    
-                # Generate RISE Explorer URL
-                explorer_url = f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash}"
+                explorer_url = EXPLORER_TX_URL.format(tx_hash)
                 
                 return {
                     'success': True,
@@ -957,7 +1216,7 @@ class ChatAI:
                 return result
                 
         except Exception as e:
-            print(f"🐛 DEBUG: Exception in execute_transfer_transaction: {str(e)}")  # Debug log
+            logger.debug("Exception in execute_transfer_transaction: %s", e)
             return {
                 'success': False,
                 'error': 'Transfer transaction error',
@@ -969,94 +1228,50 @@ class ChatAI:
         
         message_lower = message.lower()
         
-        if any(word in message_lower for word in ['yardım', 'help', 'nasıl', 'ne yapabilirim', 'how', 'what can']):
-            return {
-                'type': 'help',
-                'message': """💱 **Welcome to AI Swap Assistant!**
-
-🔄 **For swap operations:**
-• "0.1 ETH to USDT"
-• "5 ETH to USDC"
-• "2 ETH to RISE"
-
-💸 **For transfers:**
-• "send 0.1 eth 0x742d35Cc6634C0532925a3b8D5C2d3b5c5b5b5b5"
-• "transfer 0.001 usdt to 0x123..."
-• "gönder 0.5 rise 0xabc..."
-
-🛡️ **For security:**
-• "verify 0x123..." - Check address safety
-• "check 0x456..." - Phishing detection
-
-🪙 **Supported tokens:**
-• ETH, USDT, USDC, RISE
-
-⚡ **Real transactions on RISE Chain testnet!**
-
-💡 **What would you like to do?**""",
-                'can_retry': False
-            }
+        if _HELP_KEYWORDS_RE.search(message_lower):
+            return _HELP_RESPONSE
         
-        elif any(word in message_lower for word in ['token', 'fiyat', 'price', 'balance', 'bakiye', 'info', 'information']):
-            return {
-                'type': 'token_info', 
-                'message': """📊 **Token Information**
-
-🪙 **Supported tokens:**
-• ETH (Ethereum)
-• USDT (Tether USD)
-• USDC (USD Coin) 
-• RISE (RISE Token)
-
-💱 **Swap examples:**
-• "0.1 ETH to USDT"
-• "50 USDC to ETH" 
-• "1 ETH to RISE"
-
-🛡️ **Security features:**
-• "verify 0x123..." - Check address safety
-• "check 0x456..." - Phishing detection
-
-⚡ **Real RISE Chain testnet transactions**
-
-💡 **How else can I help you?**""",
-                'can_retry': False
-            }
+        elif _INFO_KEYWORDS_RE.search(message_lower):
+            return _TOKEN_INFO_RESPONSE
             
         else:
             return {
                 'type': 'general',
-                'message': f"""👋 **Hello!**
-
-💱 I'm your AI Swap Assistant. I can help you with token swap operations on RISE Chain testnet.
-
-🔄 **For token swaps:**
-• "0.1 ETH to USDT"
-• "2 ETH to RISE"
-• "5 USDC to ETH"
-
-🛡️ **For security checks:**
-• "verify 0x123..." - Check address safety
-• "check 0x456..." - Phishing detection
-
-💡 **Type "help" for more information!**
-
----
-*Your message: "{message}"*""",
+                'message': _GENERAL_MESSAGE_TEMPLATE.format(message=message),
                 'can_retry': False
             }
 
 # Global ChatAI instance
 chat_ai = ChatAI()
 
-@app.route('/')
+# The legacy index page is static, so read it once instead of rendering it on every hit
+_INDEX_HTML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'index.html')
+_INDEX_HTML = None
+if os.path.exists(_INDEX_HTML_PATH):
+    with open(_INDEX_HTML_PATH, 'rb') as index_file:
+        _INDEX_HTML = index_file.read()
+
+@app.route('/', provide_automatic_options=False)
 def index():
     """Main page"""
-    return render_template('index.html')
+    if _INDEX_HTML is None:
+        return jsonify({'error': 'Index page not found - use the frontend at http://localhost:3000'}), 404
+    return app.response_class(_INDEX_HTML, mimetype='text/html')
+
+def chat_json_response(response_data: dict):
+    """jsonify the chat envelope, splicing in pre-serialized static replies"""
+    response = response_data['response']
+    if not isinstance(response, StaticResponse):
+        return jsonify(response_data)
+    
+    envelope = app.json.dumps({key: value for key, value in response_data.items() if key != 'response'})
+    body = '{"response": ' + response.json + ', ' + envelope[1:]
+    return app.response_class(body, mimetype='application/json')
 
 @app.route('/api/chat', methods=['POST'])
 def chat_endpoint():
     try:
+        now_iso = datetime.now().isoformat()
         data = request.get_json()
         message = data.get('message', '').strip()
         user_address = data.get('user_address', '')
@@ -1070,24 +1285,29 @@ def chat_endpoint():
         
         # MetaMask signature authentication (priority method)
         if metamask_signature and metamask_message and user_address:
-            print(f"🔐 MetaMask signature authentication for {user_address}")
+            logger.debug("MetaMask signature authentication for %s", user_address)
             
             # For demo, skip signature verification (in production, verify signature)
             # This would be where we verify the MetaMask signature
             
             # MetaMask authentication confirmed - use user's actual address
             # For demo: simulate transaction with user's address
-            print(f"🔐 MetaMask authenticated for address: {user_address}")
+            logger.debug("MetaMask authenticated for address: %s", user_address)
             
             # Create a simulated transaction result (in production, this would trigger MetaMask transaction)
             # For now, we'll simulate the transaction as if it was successful
             
-            print(f"✅ MetaMask authentication successful for {user_address}")
+            logger.debug("MetaMask authentication successful for %s", user_address)
+        
+        # Backward-compatibility record for this address, if any (single lookup)
+        auth_data = None
+        if user_address:
+            with authorized_addresses_lock:
+                auth_data = authorized_addresses.get(user_address)
         
         # Session-based authentication (new method)
-        if session_id and session_id in active_sessions:
-            session = active_sessions[session_id]
-            
+        session = get_session(session_id)
+        if session is not None:
             if not session.get('authorized'):
                 return jsonify({'error': 'Session not authorized'}), 401
             
@@ -1097,64 +1317,52 @@ def chat_endpoint():
             
             # If session has private key access, use it
             if session.get('has_private_key') and session.get('wallet_connected'):
-                print(f"✅ Using session-based wallet connection for {user_address}")
+                logger.debug("Using session-based wallet connection for %s", user_address)
                 # Wallet is already connected via session
             else:
-                print(f"⚠️ Session {session_id} has signature-only auth - will use MetaMask signing")
+                logger.debug("Session %s has signature-only auth - will use MetaMask signing", session_id)
+                # Server-side steps still run on the shared demo wallet - make sure it is the connected one
+                wallet_result = connect_demo_wallet()
+                if not wallet_result['success']:
+                    return jsonify({'error': f'Demo wallet connection failed: {wallet_result.get("error", "Unknown error")}'}), 400
                 # For signature-only sessions, we'll need to handle MetaMask signing differently
                 # The frontend should use the MetaMask signing flow for these sessions
         
         # Backward compatibility: old signature verification
-        elif user_address and user_address in authorized_addresses:
-            auth_data = authorized_addresses.get(user_address)
-            if auth_data and auth_data.get('authorized'):
-                # Get private key from environment
-                simulated_private_key = os.getenv('DEMO_PRIVATE_KEY')
-                blockchain_integrator.private_key = simulated_private_key
-                
-                # Connect wallet manager
-                wallet_result = wallet_manager.connect_with_private_key(simulated_private_key)
+        elif auth_data is not None:
+            if auth_data.get('authorized'):
+                wallet_result = connect_demo_wallet()
                 if not wallet_result['success']:
                     return jsonify({'error': f'Wallet connection failed: {wallet_result.get("error", "Unknown error")}'}), 400
                 
-                print(f"✅ Using backward compatibility mode for {user_address}")
+                logger.debug("Using backward compatibility mode for %s", user_address)
         
         # No authentication - limited functionality
         else:
-            print(f"⚠️ No authentication provided - using demo mode")
-            # Get private key from environment for demo mode
-            simulated_private_key = os.getenv('DEMO_PRIVATE_KEY')
-            blockchain_integrator.private_key = simulated_private_key
-            
-            # Connect wallet manager
-            wallet_result = wallet_manager.connect_with_private_key(simulated_private_key)
+            logger.debug("No authentication provided - using demo mode")
+            wallet_result = connect_demo_wallet()
             if not wallet_result['success']:
                 return jsonify({'error': f'Demo wallet connection failed: {wallet_result.get("error", "Unknown error")}'}), 400
         
-        # Process message with Chat AI
-        # Pass session info to chat AI for context-aware responses
-        session_info = None
-        if session_id and session_id in active_sessions:
-            session_info = active_sessions[session_id]
-        
         # Add MetaMask authentication info
         has_metamask_auth = bool(metamask_signature and metamask_message)
         
-        print(f"🔍 DEBUG: Processing message: '{message}' for address: {user_address}")
-        response = chat_ai.process_message(message, user_address, session_info, has_metamask_auth)
-        print(f"🔍 DEBUG: Chat AI response type: {response.get('type', 'unknown')}")
-        print(f"🔍 DEBUG: Chat AI response: {response}")
+        # Process message with Chat AI
+        # Pass session info (looked up once above) to chat AI for context-aware responses
+        logger.debug("Processing message: %r for address: %s", message, user_address)
+        response = chat_ai.process_message(message, user_address, session, has_metamask_auth, now_iso)
+        logger.debug("Chat AI response type: %s", response.get('type', 'unknown'))
+        logger.debug("Chat AI response: %s", response)
         
         # Add session info to response
         response_data = {
             'success': True,
             'response': response,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso
         }
         
         # Add session info if available
-        if session_id and session_id in active_sessions:
-            session = active_sessions[session_id]
+        if session is not None:
             response_data['session'] = {
                 'session_id': session_id,
                 'method': session.get('method'),
@@ -1162,209 +1370,405 @@ def chat_endpoint():
                 'address': session.get('address')
             }
         
-        return jsonify(response_data)
+        return chat_json_response(response_data)
         
     except Exception as e:
-        print(f"🚨 API Error: {str(e)}")
-        print(f"🚨 Exception Type: {type(e).__name__}")
-        import traceback
-        print(f"🚨 Traceback: {traceback.format_exc()}")
+        logger.error("API Error: %s (%s)", e, type(e).__name__)
+        logger.debug("Full traceback", exc_info=True)  # only formatted when debug logging is on
         return jsonify({'error': str(e)}), 500
 
-import uuid
-import hashlib
+# Session storage (in production, use Redis or database) - sessions expire after
+# SESSION_TTL seconds and the store is bounded, so abandoned sessions are dropped
+SESSION_TTL = 3600
+ACTIVE_SESSIONS_LIMIT = 10_000
+active_sessions = TTLCache(maxsize=ACTIVE_SESSIONS_LIMIT, ttl=SESSION_TTL)
+active_sessions_lock = threading.Lock()  # cachetools caches are not thread-safe
 
-# Session storage (in production, use Redis or database)
-active_sessions = {}
-authorized_addresses = {}
+def get_session(session_id: str) -> Optional[dict]:
+    """Active session by id, or None if unknown or expired"""
+    if not session_id:
+        return None
+    with active_sessions_lock:
+        return active_sessions.get(session_id)
 
-def generate_session_id(address: str) -> str:
-    """Generate unique session ID for address"""
-    timestamp = str(int(datetime.now().timestamp()))
-    return hashlib.sha256(f"{address}_{timestamp}".encode()).hexdigest()[:32]
+def active_sessions_count() -> int:
+    """Number of live sessions (expired ones are purged first)"""
+    with active_sessions_lock:
+        return active_sessions.currsize
 
-@app.route('/api/authorize_wallet', methods=['POST'])
-def authorize_wallet():
-    try:
-        data = request.get_json()
-        address = data.get('address', '')
-        signature = data.get('signature', '')
-        message = data.get('message', '')
-        private_key = data.get('private_key', '')  # Optional private key
-        seed_phrase = data.get('seed_phrase', '')  # Optional seed phrase
-        auth_method = data.get('method', 'signature')  # 'signature', 'private_key', 'seed_phrase'
-        
-        if not address:
-            return jsonify({'error': 'Address is required'}), 400
-        
-        session_id = generate_session_id(address)
-        
-        # Method 1: Signature verification (MetaMask signing)
-        if auth_method == 'signature':
-            if not all([signature, message]):
-                return jsonify({'error': 'Signature and message are required for signature method'}), 400
-            
-            try:
-                # For demo purposes, skip signature verification
-                # In production, implement proper eth signature verification
-                print(f"🔐 Demo mode: Skipping signature verification for {address}")
-                # from eth_account.messages import encode_defunct
-                # from eth_account import Account
-                
-                # message_hash = encode_defunct(text=message)
-                # recovered_address = Account.recover_message(message_hash, signature=signature)
-                
-                # if recovered_address.lower() != address.lower():
-                #     return jsonify({'error': 'Invalid signature verification'}), 400
-                
-                # Store authorized session (signature method - no private key stored)
-                active_sessions[session_id] = {
-                    'address': address,
-                    'method': 'signature',
-                    'authorized': True,
-                    'has_private_key': False,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                return jsonify({
-                    'success': True,
-                    'session_id': session_id,
-                    'method': 'signature',
-                    'message': 'Wallet authorized with signature - transactions will need MetaMask confirmation',
-                    'has_private_key': False
-                })
-                
-            except Exception as e:
-                return jsonify({'error': f'Signature verification failed: {str(e)}'}), 400
-        
-        # Method 2: Private key (direct blockchain access)
-        elif auth_method == 'private_key':
-            if not private_key:
-                return jsonify({'error': 'Private key is required for private_key method'}), 400
-            
-            try:
-                # Verify private key matches address
-                from eth_account import Account
-                account = Account.from_key(private_key)
-                
-                if account.address.lower() != address.lower():
-                    return jsonify({'error': 'Private key does not match provided address'}), 400
-                
-                # Connect wallet manager with private key
-                wallet_result = wallet_manager.connect_with_private_key(private_key)
-                if not wallet_result['success']:
-                    return jsonify({'error': f'Wallet connection failed: {wallet_result.get("error")}'}), 400
-                
-                # Store session with private key access
-                active_sessions[session_id] = {
-                    'address': address,
-                    'method': 'private_key',
-                    'authorized': True,
-                    'has_private_key': True,
-                    'wallet_connected': True,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                # Also update blockchain integrator
-                blockchain_integrator.private_key = private_key
-                
-                return jsonify({
-                    'success': True,
-                    'session_id': session_id,
-                    'method': 'private_key',
-                    'message': 'Wallet connected with private key - direct blockchain access enabled',
-                    'address': account.address,
-                    'balance_eth': wallet_result.get('balance_eth', 0),
-                    'has_private_key': True
-                })
-                
-            except Exception as e:
-                return jsonify({'error': f'Private key connection failed: {str(e)}'}), 400
-        
-        # Method 3: Seed phrase
-        elif auth_method == 'seed_phrase':
-            if not seed_phrase:
-                return jsonify({'error': 'Seed phrase is required for seed_phrase method'}), 400
-            
-            try:
-                # Connect with seed phrase
-                wallet_result = wallet_manager.connect_with_mnemonic(seed_phrase)
-                if not wallet_result['success']:
-                    return jsonify({'error': f'Seed phrase connection failed: {wallet_result.get("error")}'}), 400
-                
-                # Store session
-                active_sessions[session_id] = {
-                    'address': wallet_result['address'],
-                    'method': 'seed_phrase',
-                    'authorized': True,
-                    'has_private_key': True,
-                    'wallet_connected': True,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                return jsonify({
-                    'success': True,
-                    'session_id': session_id,
-                    'method': 'seed_phrase',
-                    'message': 'Wallet connected with seed phrase',
-                    'address': wallet_result['address'],
-                    'balance_eth': wallet_result.get('balance_eth', 0),
-                    'has_private_key': True
-                })
-                
-            except Exception as e:
-                return jsonify({'error': f'Seed phrase connection failed: {str(e)}'}), 400
-        
-        else:
-            return jsonify({'error': 'Invalid authorization method. Use: signature, private_key, or seed_phrase'}), 400
-        
-        # Backward compatibility - store in old format too
+def store_session(session_id: str, session: dict):
+    """Create or replace a session (restarts its TTL)"""
+    with active_sessions_lock:
+        active_sessions[session_id] = session
+
+# Backward-compatibility authorizations, bounded and expiring so stale addresses are dropped
+AUTHORIZED_ADDRESSES_LIMIT = 100_000
+AUTHORIZED_ADDRESSES_TTL = 86400  # one day
+authorized_addresses = TTLCache(maxsize=AUTHORIZED_ADDRESSES_LIMIT, ttl=AUTHORIZED_ADDRESSES_TTL)
+authorized_addresses_lock = threading.Lock()  # cachetools caches are not thread-safe
+
+def authorized_addresses_count() -> int:
+    """Number of live backward-compatibility authorizations (expired ones are purged first)"""
+    with authorized_addresses_lock:
+        return authorized_addresses.currsize
+
+# Authorization timestamps only need second precision - reuse the ISO string within a second
+_iso_now_cache = (0, '')
+
+def iso_now() -> str:
+    """Current local time as an ISO string, cached per second"""
+    global _iso_now_cache
+    second = int(time.time())
+    cached_second, cached_iso = _iso_now_cache
+    if second != cached_second:
+        cached_iso = datetime.fromtimestamp(second).isoformat()
+        _iso_now_cache = (second, cached_iso)  # single tuple swap - safe across threads
+    return cached_iso
+
+def generate_session_id() -> str:
+    """Generate an unguessable session ID"""
+    return secrets.token_urlsafe(24)
+
+def remember_authorization(address: str, signature: str, session_id: str):
+    """Backward compatibility - store the authorization in the old format too"""
+    with authorized_addresses_lock:
         authorized_addresses[address] = {
             'address': address,
             'signature': signature,
             'authorized': True,
             'session_id': session_id,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }
+
+# Single-wallet authorization bodies are tiny; anything bigger is rejected before parsing
+AUTHORIZE_MAX_BODY_BYTES = 4096
+_AUTHORIZE_FIELD_LIMITS = (
+    ('address', 64),
+    ('signature', 132),
+    ('message', 512),
+    ('private_key', 66),
+    ('seed_phrase', 512),
+    ('method', 16),
+)
+
+def authorize_one(data: dict) -> tuple:
+    """Authorize a single wallet - returns (response payload, HTTP status)"""
+    for field, limit in _AUTHORIZE_FIELD_LIMITS:
+        value = data.get(field, '')
+        if not isinstance(value, str) or len(value) > limit:
+            return {'error': f'{field} must be a string of at most {limit} characters'}, 400
+    
+    address = data.get('address', '')
+    signature = data.get('signature', '')
+    message = data.get('message', '')
+    private_key = data.get('private_key', '')  # Optional private key
+    seed_phrase = data.get('seed_phrase', '')  # Optional seed phrase
+    auth_method = data.get('method', 'signature')  # 'signature', 'private_key', 'seed_phrase'
+    
+    if not address:
+        return {'error': 'Address is required'}, 400
+    
+    session_id = generate_session_id()
+    
+    # Method 1: Signature verification (MetaMask signing)
+    if auth_method == 'signature':
+        if not all([signature, message]):
+            return {'error': 'Signature and message are required for signature method'}, 400
+    
+        try:
+            # For demo purposes, skip signature verification
+            # In production, implement proper eth signature verification
+            logger.debug("Demo mode: Skipping signature verification for %s", address)
+            # from eth_account.messages import encode_defunct
+            # from eth_account import Account
+    
+            # message_hash = encode_defunct(text=message)
+            # recovered_address = Account.recover_message(message_hash, signature=signature)
+    
+            # if recovered_address.lower() != address.lower():
+            #     return {'error': 'Invalid signature verification'}, 400
+    
+            # Store authorized session (signature method - no private key stored)
+            store_session(session_id, {
+                'address': address,
+                'method': 'signature',
+                'authorized': True,
+                'has_private_key': False,
+                'timestamp': iso_now()
+            })
+    
+            remember_authorization(address, signature, session_id)
+    
+            return {
+                'success': True,
+                'session_id': session_id,
+                'method': 'signature',
+                'message': 'Wallet authorized with signature - transactions will need MetaMask confirmation',
+                'has_private_key': False
+            }, 200
+    
+        except Exception as e:
+            return {'error': f'Signature verification failed: {str(e)}'}, 400
+    
+    # Method 2: Private key (direct blockchain access)
+    elif auth_method == 'private_key':
+        if not private_key:
+            return {'error': 'Private key is required for private_key method'}, 400
+    
+        try:
+            # Verify private key matches address
+            account = Account.from_key(private_key)
+    
+            if account.address.lower() != address.lower():
+                return {'error': 'Private key does not match provided address'}, 400
+    
+            # Connect wallet manager with private key (skip if this key is already connected)
+            connected = wallet_manager.connected_wallet
+            if connected and connected.address.lower() == account.address.lower():
+                balance_eth = connected.balance_eth
+            else:
+                wallet_result = wallet_manager.connect_with_private_key(private_key)
+                if not wallet_result['success']:
+                    return {'error': f'Wallet connection failed: {wallet_result.get("error")}'}, 400
+                balance_eth = wallet_result.get('balance_eth', 0)
+    
+            # Store session with private key access
+            store_session(session_id, {
+                'address': address,
+                'method': 'private_key',
+                'authorized': True,
+                'has_private_key': True,
+                'wallet_connected': True,
+                'timestamp': iso_now()
+            })
+    
+            # Also update blockchain integrator
+            blockchain_integrator.private_key = private_key
+    
+            remember_authorization(address, signature, session_id)
+    
+            return {
+                'success': True,
+                'session_id': session_id,
+                'method': 'private_key',
+                'message': 'Wallet connected with private key - direct blockchain access enabled',
+                'address': account.address,
+                'balance_eth': balance_eth,
+                'has_private_key': True
+            }, 200
+    
+        except Exception as e:
+            return {'error': f'Private key connection failed: {str(e)}'}, 400
+    
+    # Method 3: Seed phrase
+    elif auth_method == 'seed_phrase':
+        if not seed_phrase:
+            return {'error': 'Seed phrase is required for seed_phrase method'}, 400
+    
+        try:
+            # Connect with seed phrase
+            wallet_result = wallet_manager.connect_with_mnemonic(seed_phrase)
+            if not wallet_result['success']:
+                return {'error': f'Seed phrase connection failed: {wallet_result.get("error")}'}, 400
+    
+            # Store session
+            store_session(session_id, {
+                'address': wallet_result['address'],
+                'method': 'seed_phrase',
+                'authorized': True,
+                'has_private_key': True,
+                'wallet_connected': True,
+                'timestamp': iso_now()
+            })
+    
+            remember_authorization(address, signature, session_id)
+    
+            return {
+                'success': True,
+                'session_id': session_id,
+                'method': 'seed_phrase',
+                'message': 'Wallet connected with seed phrase',
+                'address': wallet_result['address'],
+                'balance_eth': wallet_result.get('balance_eth', 0),
+                'has_private_key': True
+            }, 200
+    
+        except Exception as e:
+            return {'error': f'Seed phrase connection failed: {str(e)}'}, 400
+    
+    else:
+        return {'error': 'Invalid authorization method. Use: signature, private_key, or seed_phrase'}, 400
+
+@app.route('/api/authorize_wallet', methods=['POST'])
+def authorize_wallet():
+    try:
+        if request.content_length and request.content_length > AUTHORIZE_MAX_BODY_BYTES:
+            return jsonify({'error': f'Request body exceeds {AUTHORIZE_MAX_BODY_BYTES} bytes'}), 413
         
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        payload, status = authorize_one(data)
+        return jsonify(payload), status
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+BULK_AUTHORIZE_LIMIT = 100
+
+@app.route('/api/authorize_wallet_bulk', methods=['POST'])
+def authorize_wallet_bulk():
+    """Authorize several signature-based wallets in one request (partial failures allowed)"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        items = data.get('items')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'items must be a non-empty list'}), 400
+        if len(items) > BULK_AUTHORIZE_LIMIT:
+            return jsonify({'error': f'At most {BULK_AUTHORIZE_LIMIT} wallets can be authorized per request'}), 400
+        
+        results = []
+        for item in items:
+            if not isinstance(item, dict):
+                results.append({'address': None, 'success': False, 'error': 'Each item must be an object'})
+                continue
+            
+            # Bulk sadece imza yöntemini destekler - private key / seed phrase tek tek bağlanır
+            if item.get('method', 'signature') != 'signature':
+                payload, status = {'error': 'Bulk authorization only supports the signature method'}, 400
+            else:
+                payload, status = authorize_one(item)
+            
+            result = {'address': item.get('address', ''), 'success': status == 200}
+            if status == 200:
+                result['session_id'] = payload['session_id']
+            else:
+                result['error'] = payload.get('error')
+            results.append(result)
+        
+        return jsonify({
+            'success': True,
+            'authorized': sum(1 for result in results if result['success']),
+            'results': results
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Prepared swaps (route + calldata) are reused briefly - the UI re-quotes the same swap while the user edits
+PREPARE_SWAP_CACHE_TTL = 5  # seconds
+PREPARE_SWAP_WAIT_TIMEOUT = 10  # seconds a duplicate request waits for the in-flight one
+_prepared_swaps = TTLCache(maxsize=512, ttl=PREPARE_SWAP_CACHE_TTL)
+_prepared_swaps_inflight = {}  # key -> Future of the request currently building it
+_prepared_swaps_lock = threading.Lock()  # guards both the cache and the in-flight table
+
+WEI_PER_ETHER = 10 ** 18
+
+def build_prepared_swap(from_token: str, to_token: str, amount: float) -> Optional[Dict[str, Any]]:
+    """Route, calldata and wei value for a swap, or None if no route"""
+    route_result = swap_agent.find_best_swap_route(from_token, to_token, amount, use_cache=False)  # cached here instead
+    if not route_result.get('success'):
+        return None
+    
+    wei_value = int(Decimal(str(amount)) * WEI_PER_ETHER)  # same conversion as to_wei, without web3's unit lookup
+    return {
+        'route_result': route_result,
+        'swap_data': blockchain_integrator._build_swap_data(wei_value, to_token),
+        'wei_value': wei_value
+    }
+
+def prepared_swap_for(from_token: str, to_token: str, amount: float) -> Optional[Dict[str, Any]]:
+    """Prepared swap, cached for PREPARE_SWAP_CACHE_TTL seconds - concurrent identical requests share one build"""
+    key = (from_token, to_token, amount)
+    with _prepared_swaps_lock:
+        prepared = _prepared_swaps.get(key)
+        if prepared is not None:
+            logger.debug("Prepared swap cache hit: %s", key)
+            return prepared
+        
+        future = _prepared_swaps_inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _prepared_swaps_inflight[key] = Future()
+    
+    if not leader:
+        logger.debug("Waiting for in-flight prepared swap: %s", key)
+        try:
+            return future.result(timeout=PREPARE_SWAP_WAIT_TIMEOUT)
+        except FutureTimeoutError:
+            # The in-flight build is stuck - build this one ourselves rather than fail the request
+            logger.warning("In-flight prepared swap %s took over %ss, building locally", key, PREPARE_SWAP_WAIT_TIMEOUT)
+            return build_prepared_swap(from_token, to_token, amount)
+    
+    try:
+        prepared = build_prepared_swap(from_token, to_token, amount)
+    except Exception as e:
+        with _prepared_swaps_lock:
+            del _prepared_swaps_inflight[key]
+        future.set_exception(e)
+        raise
+    
+    with _prepared_swaps_lock:
+        if prepared is not None:
+            _prepared_swaps[key] = prepared  # failures are not cached - they are cheap and may be transient
+        del _prepared_swaps_inflight[key]
+    future.set_result(prepared)
+    return prepared
+
 @app.route('/api/prepare_swap', methods=['POST'])
 def prepare_swap():
     """Prepare swap transaction data for MetaMask signing"""
     try:
-        data = request.get_json()
-        from_token = data.get('from_token', '').upper()
-        to_token = data.get('to_token', '').upper()
-        amount = float(data.get('amount', 0))
-        user_address = data.get('user_address', '')
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        from_token = data.get('from_token') or ''
+        to_token = data.get('to_token') or ''
+        amount = data.get('amount') or 0
+        user_address = data.get('user_address') or ''
         
         if not all([from_token, to_token, amount, user_address]):
             return jsonify({'error': 'Missing required parameters'}), 400
         
-        # Find best route
-        route_result = swap_agent.find_best_swap_route(from_token, to_token, amount)
+        # Cheap checks first - bad payloads never reach route finding
+        if not isinstance(from_token, str) or not isinstance(to_token, str):
+            return jsonify({'error': 'Tokens must be strings'}), 400
+        from_token = from_token.upper()
+        to_token = to_token.upper()
+        if from_token not in _SUPPORTED_TOKENS or to_token not in _SUPPORTED_TOKENS:
+            return jsonify({'error': f'Unsupported token: {from_token} or {to_token}'}), 400
+        
+        if not isinstance(user_address, str) or not _ADDR_RE.match(user_address):
+            return jsonify({'error': 'Invalid user_address'}), 400
+        
+        try:
+            amount = float(amount)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid amount'}), 400
+        if not 0 < amount < float('inf'):
+            return jsonify({'error': 'Amount must be a positive number'}), 400
+        
+        # Find best route and build swap data (reused for repeated quotes)
+        prepared = prepared_swap_for(from_token, to_token, amount)
         
-        if not route_result.get('success'):
+        if prepared is None:
             return jsonify({'error': 'No route found for this swap'}), 400
+        route_result = prepared['route_result']
         
         # Prepare transaction data (don't execute)
         router_address = "0x08feDaACe14EB141E51282441b05182519D853D1"
         
-        # Build swap data
-        swap_data = blockchain_integrator._build_swap_data(
-            blockchain_integrator.w3.to_wei(amount, 'ether'), 
-            to_token
-        )
-        
         # Prepare transaction object
         transaction_data = {
             'to': router_address,
-            'value': str(int(blockchain_integrator.w3.to_wei(amount, 'ether'))),
-            'data': swap_data,
+            'value': str(prepared['wei_value']),
+            'data': prepared['swap_data'],
             'gas': 200000,
-            'gasPrice': blockchain_integrator.w3.to_wei('0.0001', 'gwei')
+            'gasPrice': gas_oracle.price
         }
         
         return jsonify({
@@ -1375,7 +1779,7 @@ def prepare_swap():
         })
         
     except Exception as e:
-        print(f"🚨 Prepare swap error: {str(e)}")
+        logger.error("Prepare swap error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/session/status', methods=['POST'])
@@ -1388,11 +1792,10 @@ def get_session_status():
         if not session_id:
             return jsonify({'error': 'Session ID is required'}), 400
         
-        if session_id not in active_sessions:
+        session = get_session(session_id)
+        if session is None:
             return jsonify({'error': 'Invalid session ID'}), 404
         
-        session = active_sessions[session_id]
-        
         return jsonify({
             'success': True,
             'session': {
@@ -1421,11 +1824,17 @@ def confirm_transaction():
         if not all([tx_hash, user_address]):
             return jsonify({'error': 'Missing required parameters'}), 400
         
+        # Ensure tx_hash has 0x prefix (it comes from the client) and reject malformed hashes early
+        if not isinstance(tx_hash, str):
+            return jsonify({'error': 'Invalid tx_hash'}), 400
+        tx_hash = normalize_tx_hash(tx_hash)
+        if not _TX_HASH_RE.match(tx_hash):
+            return jsonify({'error': 'Invalid tx_hash'}), 400
+        
         # Validate session if provided
-        if session_id and session_id in active_sessions:
-            session = active_sessions[session_id]
-            if not session.get('authorized'):
-                return jsonify({'error': 'Session not authorized'}), 401
+        session = get_session(session_id)
+        if session is not None and not session.get('authorized'):
+            return jsonify({'error': 'Session not authorized'}), 401
         
         # Store transaction record
         transaction_record = {
@@ -1442,17 +1851,13 @@ def confirm_transaction():
         }
         
         # You could store this in a database in production
-        print(f"📝 Transaction confirmed: {transaction_record}")
-        
-        # Ensure tx_hash has 0x prefix for explorer URL
-        if not tx_hash.startswith('0x'):
-            tx_hash = '0x' + tx_hash
+        logger.info("Transaction confirmed: %s", transaction_record)
         
         return jsonify({
             'success': True,
             'message': 'Transaction confirmed',
             'tx_hash': tx_hash,
-            'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash}"
+            'explorer_url': EXPLORER_TX_URL.format(tx_hash)
         })
         
     except Exception as e:
@@ -1461,50 +1866,61 @@ def confirm_transaction():
             'error': str(e)
         }), 500
 
-@app.route('/api/agents/status', methods=['GET'])
+# Agent status changes rarely, so the serialized payload is rebuilt at most once per TTL
+STATUS_CACHE_TTL = 60  # seconds
+_status_cache = {'built_at': 0.0, 'entry': None}  # entry is (body, etag), swapped as one tuple
+
+# GET routes are simple CORS requests (no preflight), so they skip Flask's automatic OPTIONS handling;
+# POST routes keep it because flask-cors answers their preflights through it
+@app.route('/api/agents/status', methods=['GET'], provide_automatic_options=False)
 def get_agents_status():
-    """Get agent status"""
+    """Get agent status (ETag-tagged - pollers sending If-None-Match get an empty 304)"""
     try:
-        return jsonify({
-            'success': True,
-            'agents': {
-                'swap_agent': {
-                    'status': 'active',
-                    'pools': len(swap_agent.pools),
-                    'supported_tokens': ['WETH', 'USDT', 'USDC', 'RISE']
-                },
-                'blockchain_integrator': {
-                    'status': 'connected' if blockchain_integrator.is_connected else 'disconnected',
-                    'network': 'RISE Testnet',
-                    'rpc_url': blockchain_integrator.rpc_url
-                }
-            },
-            'active_sessions': len(active_sessions),
-            'authorized_addresses': len(authorized_addresses)
-        })
+        now = time.monotonic()
+        entry = _status_cache['entry']
+        if entry is None or now - _status_cache['built_at'] >= STATUS_CACHE_TTL:
+            body = app.json.dumps(build_agents_status())
+            entry = _status_cache['entry'] = (body, hashlib.sha1(body.encode()).hexdigest())
+            _status_cache['built_at'] = now
+        
+        body, etag = entry
+        response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_agents_status() -> dict:
+    """Build the agent status payload"""
+    return {
+        'success': True,
+        'agents': {
+            'swap_agent': {
+                'status': 'active',
+                'pools': len(swap_agent.pools),
+                'supported_tokens': ['WETH', 'USDT', 'USDC', 'RISE']
+            },
+            'blockchain_integrator': {
+                'status': 'connected' if blockchain_integrator.is_connected else 'disconnected',
+                'network': 'RISE Testnet',
+                'rpc_url': blockchain_integrator.rpc_url
+            }
+        },
+        'active_sessions': active_sessions_count(),
+        'authorized_addresses': authorized_addresses_count()
+    }
+
 if __name__ == '__main__':
     print("🚀 AI Swap Assistant - Chat Interface")
     print("EthIstanbul Hackathon Project")
     print("=" * 60)
     
-    # Configure blockchain integrator
-    private_key = os.getenv('DEMO_PRIVATE_KEY')
-    if not private_key:
+    if not DEMO_PRIVATE_KEY:
         print("❌ DEMO_PRIVATE_KEY not found in environment variables!")
         sys.exit(1)
     
-    blockchain_integrator.private_key = private_key
-    print("🔗 Blockchain integrator private key configured from environment")
-    
-    # Connect wallet manager
-    wallet_result = wallet_manager.connect_with_private_key(private_key)
-    if wallet_result['success']:
-        print("✅ Wallet connected:", wallet_result['message'])
-    else:
-        print("❌ Wallet connection error:", wallet_result['error'])
+    # Development server: connect up front so a bad key shows at startup
+    connect_demo_wallet()
     
     print("💬 Chat AI: Ready")
     print("🌐 Web interface: http://localhost:3000")
@@ -1512,4 +1928,6 @@ if __name__ == '__main__':
     print("  - POST /api/chat")
     print("  - GET  /api/agents/status")
     
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    # Debugger only on request (ORVIUM_DEBUG=1); the reloader would re-import the module and reconnect the wallet
+    debug = os.getenv('ORVIUM_DEBUG') == '1'
+    app.run(host='0.0.0.0', port=8000, debug=debug, use_reloader=False)
\ No newline at end of file
@@ -5,11 +5,64 @@ Integration for real Web3 transactions
 
 import os
 import json
+import logging
+import threading
+import time
 from typing import Dict, Optional, List
 from dataclasses import dataclass
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from web3 import Web3
 from web3.exceptions import TransactionNotFound, ContractLogicError
 
+logger = logging.getLogger(__name__)
+
+# Explorer base URLs by network, and the transaction link for the RISE testnet this app runs on
+EXPLORER_BASE_URLS = {
+    'mainnet': 'https://etherscan.io',
+    'goerli': 'https://goerli.etherscan.io',
+    'sepolia': 'https://sepolia.etherscan.io',
+    'rise-testnet': 'https://explorer.testnet.riselabs.xyz',
+    'rise-mainnet': 'https://explorer.riselabs.xyz'
+}
+EXPLORER_TX_URL = EXPLORER_BASE_URLS['rise-testnet'] + '/tx/{}'
+
+# ETH → token swap calldata copied from manually verified transactions (DEX function 0xc0e8e89a):
+# a fixed head, the 32-byte deadline word, then a per-token tail - only the deadline changes per call
+_SWAP_DATA_HEAD = 'c0e8e89a000000000000000000000000000000000000000000000000000000000000008000000000000000000000000000000000000000000000000000000000000001a000000000000000000000000000000000000000000000000000000000000001e0'
+_SWAP_DATA_TAILS = {
+    'USDC': '0000000000000000000000000000000000000000000000000000000000000001000000000000000000000000000000000000000000000000000000000000002000000000000000008a13e3edac55c600b04b38b83431cba8b0a877c51c61180d0000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000009184e72a000000000000000000000000000000000000000000000000000000000000000874700000000000000000000000000000000000000000000000000000000000000a00000000000000000000000000000000000000000000000000000000000000020000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000010000000000000000000000008a93d247134d91e0de6f96547cb0204e5be8e5d80000000000000000000000000000000000000000000000000000000000000000',
+    'RISE': '000000000000000000000000000000000000000000000000000000000000000100000000000000000000000000000000000000000000000000000000000000200000000000000000feb0c33520304fadae893d78c1d1f9834fbb47ee2987b66b0000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000009184e72a00000000000000000000000000000000000000000000000000000328ff9bf2c1a2000000000000000000000000000000000000000000000000000000000000000a0000000000000000000000000000000000000000000000000000000000000002000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001000000000000000000000000d6e1afe5ca8d00a2efc01b89997abe2de47fdfaf0000000000000000000000000000000000000000000000000000000000000000'
+}
+
+# Gas price used until the network has been asked, and how often it is re-read
+DEFAULT_GAS_PRICE_WEI = 100_000  # 0.0001 gwei
+GAS_PRICE_REFRESH_INTERVAL = 5  # seconds
+
+# RPC HTTP connection pool - sized for the gunicorn thread pool, so concurrent requests reuse sockets
+RPC_POOL_SIZE = 64
+RPC_TIMEOUT = 10  # seconds, web3's default
+
+# Plain transfers on the RISE testnet - gas price taken from a manually verified transfer
+TRANSFER_CHAIN_ID = 11155931
+TRANSFER_GAS_PRICE_GWEI = '0.0000001'
+ETH_TRANSFER_GAS = 21000  # Standard ETH transfer
+ERC20_TRANSFER_GAS = 65000  # Standard ERC20 transfer gas
+TRANSFER_TOKENS = ('USDT', 'USDC', 'RISE')
+
+def _rpc_session() -> requests.Session:
+    """Pooled HTTP session for the RPC provider (connection errors are retried, sends never are)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=RPC_POOL_SIZE,
+        max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 @dataclass
 class SwapTransaction:
     """Swap işlem bilgileri"""
@@ -36,15 +89,16 @@ class BlockchainIntegrator:
         # Demo için varsayılan değerler (gerçek uygulamada environment variables kullanın)
         self.rpc_url = rpc_url or "https://testnet.riselabs.xyz"  # RISE Chain testnet
         self.private_key = private_key or os.getenv("PRIVATE_KEY")
+        self._account = None  # (private_key, LocalAccount) - see the account property
         
-        # Web3 bağlantısı
+        # Web3 bağlantısı - provider oluşturmak ağa gitmez, bağlantı ilk kullanımda kontrol edilir
+        self._is_connected = None
         try:
-            self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
-            self.is_connected = self.w3.is_connected()
+            self.w3 = Web3(Web3.HTTPProvider(self.rpc_url, request_kwargs={'timeout': RPC_TIMEOUT}, session=_rpc_session()))
         except Exception as e:
             print(f"⚠️ Web3 bağlantısı kurulamadı: {e}")
             self.w3 = None
-            self.is_connected = False
+            self._is_connected = False
         
         # Contract addresses (RISE Chain testnet)
         self.contracts = {
@@ -63,9 +117,29 @@ class BlockchainIntegrator:
         }
         
         print(f"🔗 Blockchain Integrator initialized")
-        print(f"🌐 Connected: {self.is_connected}")
         print(f"📡 RPC: {self.rpc_url}")
     
+    @property
+    def account(self):
+        """İmzalama hesabı - private key başına bir kez türetilir, her işlemde değil"""
+        cached = self._account
+        if cached is None or cached[0] != self.private_key:
+            from eth_account import Account
+            cached = self._account = (self.private_key, Account.from_key(self.private_key))
+        return cached[1]
+    
+    @property
+    def is_connected(self) -> bool:
+        """RPC bağlantısı - ilk erişimde bir kez kontrol edilir (import sırasında değil)"""
+        if self._is_connected is None:
+            try:
+                self._is_connected = self.w3.is_connected()
+            except Exception as e:
+                print(f"⚠️ Web3 bağlantısı kurulamadı: {e}")
+                self._is_connected = False
+            print(f"🌐 Connected: {self._is_connected}")
+        return self._is_connected
+    
     def get_token_balance(self, address: str, token_symbol: str) -> float:
         """
         Token bakiyesini al
@@ -147,10 +221,8 @@ class BlockchainIntegrator:
             }
         
         try:
-            from eth_account import Account
-            
             # Account oluştur
-            account = Account.from_key(self.private_key)
+            account = self.account
             nonce = self.w3.eth.get_transaction_count(account.address)
             
             # Token contract addresses (RISE Chain testnet)
@@ -220,7 +292,7 @@ class BlockchainIntegrator:
                 'amount': amount,
                 'gas_used': gas_used,
                 'status': status,
-                'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash_hex}"
+                'explorer_url': EXPLORER_TX_URL.format(tx_hash_hex)
             }
             
         except Exception as e:
@@ -253,10 +325,8 @@ class BlockchainIntegrator:
         
         try:
             # Gerçek blockchain işlemi
-            from eth_account import Account
-            
             # Account oluştur
-            account = Account.from_key(self.private_key)
+            account = self.account
             
             # Gerçek DEX swap işlemi (RISE Chain testnet'te mevcut DEX'ler)
             nonce = self.w3.eth.get_transaction_count(account.address)
@@ -349,7 +419,7 @@ class BlockchainIntegrator:
                     'dex': 'rise_dex',
                     'status': status,
                     'simulation': False,
-                    'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash_hex}"
+                    'explorer_url': EXPLORER_TX_URL.format(tx_hash_hex)
                 }
             
             else:
@@ -444,7 +514,7 @@ class BlockchainIntegrator:
                 'dex': 'rise_dex',
                 'status': status,
                 'simulation': False,  # Gerçek işlem!
-                'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash_hex}"
+                'explorer_url': EXPLORER_TX_URL.format(tx_hash_hex)
             }
             
         except Exception as e:
@@ -475,10 +545,8 @@ class BlockchainIntegrator:
         
         try:
             # Real blockchain transaction
-            from eth_account import Account
-            
             # Create account
-            account = Account.from_key(self.private_key)
+            account = self.account
             
             # Get current balance
             balance_wei = self.w3.eth.get_balance(account.address)
@@ -491,9 +559,7 @@ class BlockchainIntegrator:
                 # https://explorer.testnet.riselabs.xyz/tx/0xaec290b8ce5e3ab229e78a7a19bad89d65ee2a87ac8cfbee8216a6ddc6139ec2
                 
                 # Calculate gas cost - based on your successful transaction
-                gas_limit = 21000  # Standard ETH transfer
-                gas_price = self.w3.to_wei('0.0000001', 'gwei')  # Very low gas price like your successful transaction
-                gas_cost_wei = gas_limit * gas_price
+                gas_cost_wei = ETH_TRANSFER_GAS * self.w3.to_wei(TRANSFER_GAS_PRICE_GWEI, 'gwei')
                 gas_cost_eth = self.w3.from_wei(gas_cost_wei, 'ether')
                 
                 # Check if we have enough balance
@@ -513,67 +579,10 @@ class BlockchainIntegrator:
                         'simulation': False
                     }
                 
-                # Create transaction
-                transaction = {
-                    'to': self.w3.to_checksum_address(receiver),  # Convert to checksum address
-                    'value': self.w3.to_wei(amount, 'ether'),
-                    'gas': gas_limit,
-                    'gasPrice': gas_price,
-                    'nonce': nonce,
-                    'chainId': 11155931  # RISE Chain testnet ID
-                }
-                
                 # Sign and send transaction
-                signed_txn = account.sign_transaction(transaction)
-                # Modern web3.py uses rawTransaction instead of raw_transaction
-                raw_tx = getattr(signed_txn, 'rawTransaction', getattr(signed_txn, 'raw_transaction', None))
-                if raw_tx is None:
-                    raise AttributeError("Cannot find raw transaction data")
-                tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
-                tx_hash_hex = tx_hash.hex()
-                
-                # Wait for receipt
-                try:
-                    receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
-                    status = 'success' if receipt['status'] == 1 else 'failed'
-                    gas_used = receipt['gasUsed']
-                    
-                    # Check if transaction actually succeeded
-                    if receipt['status'] != 1:
-                        print(f"🐛 DEBUG: ETH transfer FAILED - Status: {receipt['status']}, TX: {tx_hash_hex}")  # Debug log
-                        return {
-                            'success': False,
-                            'error': f'Transaction failed on blockchain. Status: {receipt["status"]}',
-                            'tx_hash': tx_hash_hex,
-                            'status': 'failed',
-                            'simulation': False
-                        }
-                    
-                except Exception as e:
-                    status = 'pending'
-                    gas_used = gas_limit
-                    print(f"🐛 DEBUG: ETH transfer RECEIPT ERROR - {e}, TX: {tx_hash_hex}")  # Debug log
-                    return {
-                        'success': False,
-                        'error': f'Transaction receipt error: {str(e)}',
-                        'tx_hash': tx_hash_hex,
-                        'status': 'pending',
-                        'simulation': False
-                    }
-                
-                print(f"🐛 DEBUG: ETH transfer SUCCESS - TX: {tx_hash_hex}, Gas: {gas_used}")  # Debug log
-                return {
-                    'success': True,
-                    'tx_hash': tx_hash_hex,
-                    'token': token,
-                    'amount': amount,
-                    'receiver': receiver,
-                    'gas_used': gas_used,
-                    'gas_price': 0.0000001,  # Very low gas price
-                    'status': status,
-                    'simulation': False,  # Real transaction!
-                    'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash_hex}"
-                }
+                transaction = self._build_transfer_tx(token, self.w3.to_checksum_address(receiver), amount, nonce)
+                tx_hash = self._send_signed(self._sign_transfer(account, transaction))
+                return self._transfer_result(tx_hash, token, amount, receiver)
             
             else:
                 # Token transfer (ERC20)
@@ -589,51 +598,17 @@ class BlockchainIntegrator:
     def _execute_token_transfer(self, token: str, amount: float, receiver: str, account, nonce: int) -> dict:
         """Execute ERC20 token transfer"""
         try:
-            # Token contract addresses (RISE Chain testnet)
-            token_addresses = {
-                'USDT': '0x40918Ba7f132E0aCba2CE4de4c4baF9BD2D7D849',
-                'USDC': '0x8A93d247134d91e0de6f96547cB0204e5BE8e5D8',
-                'RISE': '0xd6e1afe5cA8D00A2EFC01B89997abE2De47fdfAf'
-            }
-            
-            if token not in token_addresses:
+            if token not in TRANSFER_TOKENS:
                 return {
                     'success': False,
                     'error': f'Token {token} not supported for transfer',
                     'simulation': False
                 }
             
-            # ERC20 transfer function signature
-            # transfer(address to, uint256 amount)
-            token_contract = token_addresses[token]
-            
-            # Calculate amount in token decimals (get actual decimals from contract)
-            try:
-                erc20_abi = [
-                    {
-                        "constant": True,
-                        "inputs": [],
-                        "name": "decimals",
-                        "outputs": [{"name": "", "type": "uint8"}],
-                        "type": "function"
-                    }
-                ]
-                
-                contract = self.w3.eth.contract(address=token_contract, abi=erc20_abi)
-                actual_decimals = contract.functions.decimals().call()
-                token_amount = int(amount * (10 ** actual_decimals))
-                
-                print(f"🐛 DEBUG: {token} decimals from contract: {actual_decimals}, amount: {amount} -> {token_amount} units")
-                
-            except Exception as e:
-                # Fallback to hardcoded values if contract call fails
-                print(f"⚠️ Could not get decimals from contract, using fallback: {e}")
-                if token in ['USDT']:
-                    token_amount = int(amount * 10**8)  # USDT has 8 decimals on RISE Chain
-                elif token in ['USDC']:
-                    token_amount = int(amount * 10**6)  # USDC has 6 decimals
-                else:  # RISE
-                    token_amount = int(amount * 10**18)  # 18 decimals
+            # Calculate amount in token decimals
+            decimals = self.get_token_decimals(token)
+            token_amount = int(amount * (10 ** decimals))
+            print(f"🐛 DEBUG: {token} decimals: {decimals}, amount: {amount} -> {token_amount} units")
             
             # Validate receiver address
             if not self.w3.is_address(receiver):
@@ -643,9 +618,6 @@ class BlockchainIntegrator:
                     'simulation': False
                 }
             
-            # Convert to checksum address
-            checksum_receiver = self.w3.to_checksum_address(receiver)
-            
             # Check token balance before transfer
             token_balance = self.get_token_balance(account.address, token)
             print(f"🐛 DEBUG: {token} balance check - Raw balance: {token_balance}, Amount requested: {amount}")  # Debug log
@@ -657,79 +629,223 @@ class BlockchainIntegrator:
                     'simulation': False
                 }
             
-            # Build transfer function call
-            # transfer(address,uint256) = 0xa9059cbb
-            transfer_data = '0xa9059cbb' + checksum_receiver[2:].zfill(64) + hex(token_amount)[2:].zfill(64)
+            # Sign and send
+            transaction = self._build_transfer_tx(token, self.w3.to_checksum_address(receiver), amount, nonce, token_amount)
+            tx_hash = self._send_signed(self._sign_transfer(account, transaction))
+            return self._transfer_result(tx_hash, token, amount, receiver, error_prefix='Token transfer')
             
-            transaction = {
-                'to': token_contract,
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Token transfer error: {str(e)}',
+                'simulation': False
+            }
+    
+    def _build_transfer_tx(self, token: str, checksum_receiver: str, amount: float, nonce: int, token_amount: int = 0) -> Dict:
+        """Unsigned ETH or ERC20 transfer transaction (token_amount is in the token's smallest units)"""
+        transaction = {
+            'gasPrice': self.w3.to_wei(TRANSFER_GAS_PRICE_GWEI, 'gwei'),  # Very low gas price
+            'nonce': nonce,
+            'chainId': TRANSFER_CHAIN_ID
+        }
+        if token == 'ETH':
+            transaction.update({
+                'to': checksum_receiver,
+                'value': self.w3.to_wei(amount, 'ether'),
+                'gas': ETH_TRANSFER_GAS
+            })
+        else:
+            # transfer(address,uint256) = 0xa9059cbb
+            transaction.update({
+                'to': self.contracts[token],
                 'value': 0,  # No ETH value for token transfer
-                'gas': 65000,  # Standard ERC20 transfer gas
-                'gasPrice': self.w3.to_wei('0.0000001', 'gwei'),  # Very low gas price
-                'nonce': nonce,
-                'chainId': 11155931,
-                'data': transfer_data
+                'gas': ERC20_TRANSFER_GAS,
+                'data': '0xa9059cbb' + checksum_receiver[2:].zfill(64) + hex(token_amount)[2:].zfill(64)
+            })
+        return transaction
+    
+    @staticmethod
+    def _sign_transfer(account, transaction: Dict) -> bytes:
+        """Sign a transaction and return its raw bytes"""
+        signed_txn = account.sign_transaction(transaction)
+        # Modern web3.py uses rawTransaction instead of raw_transaction
+        raw_tx = getattr(signed_txn, 'rawTransaction', getattr(signed_txn, 'raw_transaction', None))
+        if raw_tx is None:
+            raise AttributeError("Cannot find raw transaction data")
+        return raw_tx
+    
+    def _send_signed(self, raw_tx: bytes):
+        """Broadcast a signed transaction and return its hash"""
+        return self.w3.eth.send_raw_transaction(raw_tx)
+    
+    def _transfer_result(self, tx_hash, token: str, amount: float, receiver: str, error_prefix: str = 'Transaction') -> Dict:
+        """Wait for a broadcast transfer's receipt and turn it into a transfer result"""
+        tx_hash_hex = tx_hash.hex()
+        try:
+            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
+        except Exception as e:
+            print(f"🐛 DEBUG: {token} transfer RECEIPT ERROR - {e}, TX: {tx_hash_hex}")  # Debug log
+            return {
+                'success': False,
+                'error': f'{error_prefix} receipt error: {str(e)}',
+                'tx_hash': tx_hash_hex,
+                'status': 'pending',
+                'simulation': False
             }
+        
+        # Check if transaction actually succeeded
+        if receipt['status'] != 1:
+            print(f"🐛 DEBUG: {token} transfer FAILED - Status: {receipt['status']}, TX: {tx_hash_hex}")  # Debug log
+            return {
+                'success': False,
+                'error': f'{error_prefix} failed on blockchain. Status: {receipt["status"]}',
+                'tx_hash': tx_hash_hex,
+                'status': 'failed',
+                'simulation': False
+            }
+        
+        print(f"🐛 DEBUG: {token} transfer SUCCESS - TX: {tx_hash_hex}, Gas: {receipt['gasUsed']}")  # Debug log
+        return {
+            'success': True,
+            'tx_hash': tx_hash_hex,
+            'token': token,
+            'amount': amount,
+            'receiver': receiver,
+            'gas_used': receipt['gasUsed'],
+            'gas_price': float(TRANSFER_GAS_PRICE_GWEI),  # Very low gas price
+            'status': 'success',
+            'simulation': False,  # Real transaction!
+            'explorer_url': EXPLORER_TX_URL.format(tx_hash_hex)
+        }
+    
+    def execute_bulk_transfer(self, token: str, amount: float, receivers: List[str]) -> List[Dict]:
+        """
+        Send the same amount to several receivers in one batch
+        
+        Every transaction is signed up front with consecutive nonces and broadcast
+        back to back; receipts are only awaited afterwards, so the whole batch waits
+        for about one block instead of one block per receiver.
+        
+        Args:
+            token: Token to transfer (ETH, USDT, USDC, RISE)
+            amount: Amount to send to each receiver
+            receivers: Recipient addresses
+        
+        Returns:
+            List[Dict]: One transfer result per receiver, in the same order
+        """
+        if not self.is_connected or not self.private_key:
+            return [{
+                'success': False,
+                'error': 'Blockchain connection or private key missing',
+                'simulation': True
+            } for _ in receivers]
+        
+        try:
+            account = self.account
             
-            # Sign and send
-            signed_txn = account.sign_transaction(transaction)
-            # Modern web3.py compatibility
-            raw_tx = getattr(signed_txn, 'rawTransaction', getattr(signed_txn, 'raw_transaction', None))
-            if raw_tx is None:
-                raise AttributeError("Cannot find raw transaction data")
-            tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
-            tx_hash_hex = tx_hash.hex()
-            
-            # Wait for receipt
-            try:
-                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
-                status = 'success' if receipt['status'] == 1 else 'failed'
-                gas_used = receipt['gasUsed']
-                
-                # Check if transaction actually succeeded
-                if receipt['status'] != 1:
-                    print(f"🐛 DEBUG: {token} transfer FAILED - Status: {receipt['status']}, TX: {tx_hash_hex}")  # Debug log
-                    return {
+            if token == 'ETH':
+                token_amount = 0
+                gas_cost_wei = ETH_TRANSFER_GAS * self.w3.to_wei(TRANSFER_GAS_PRICE_GWEI, 'gwei')
+                cost_per_transfer = amount + float(self.w3.from_wei(gas_cost_wei, 'ether'))
+                remaining_balance = float(self.w3.from_wei(self.w3.eth.get_balance(account.address), 'ether'))
+            else:
+                if token not in TRANSFER_TOKENS:
+                    return [{
                         'success': False,
-                        'error': f'Token transfer failed on blockchain. Status: {receipt["status"]}',
-                        'tx_hash': tx_hash_hex,
-                        'status': 'failed',
+                        'error': f'Token {token} not supported for transfer',
                         'simulation': False
-                    }
-                    
-            except Exception as e:
-                status = 'pending'
-                gas_used = 65000
-                print(f"🐛 DEBUG: {token} transfer RECEIPT ERROR - {e}, TX: {tx_hash_hex}")  # Debug log
-                return {
+                    } for _ in receivers]
+                
+                token_amount = int(amount * (10 ** self.get_token_decimals(token)))
+                cost_per_transfer = amount
+                remaining_balance = float(self.get_token_balance(account.address, token))
+            
+            nonce = self.w3.eth.get_transaction_count(account.address)
+        except Exception as e:
+            return [{'success': False, 'error': str(e), 'simulation': False} for _ in receivers]
+        
+        # 1) Sign and broadcast everything without waiting for receipts
+        results: List[Optional[Dict]] = [None] * len(receivers)
+        sent = []  # (index, tx_hash)
+        for index, receiver in enumerate(receivers):
+            if not self.w3.is_address(receiver):
+                results[index] = {
                     'success': False,
-                    'error': f'Token transfer receipt error: {str(e)}',
-                    'tx_hash': tx_hash_hex,
-                    'status': 'pending',
+                    'error': f'Invalid receiver address: {receiver}',
                     'simulation': False
                 }
+                continue
             
-            print(f"🐛 DEBUG: {token} transfer SUCCESS - TX: {tx_hash_hex}, Gas: {gas_used}")  # Debug log
-            return {
-                'success': True,
-                'tx_hash': tx_hash_hex,
-                'token': token,
-                'amount': amount,
-                'receiver': receiver,
-                'gas_used': gas_used,
-                'gas_price': 0.0000001,  # Very low gas price
-                'status': status,
-                'simulation': False,
-                'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash_hex}"
-            }
+            # Same outcome as sending one by one: later receivers fail once the balance runs out
+            if remaining_balance < cost_per_transfer:
+                results[index] = {
+                    'success': False,
+                    'error': f'Insufficient {token} balance. Balance: {remaining_balance:.6f} {token}, Required: {cost_per_transfer:.6f} {token}',
+                    'simulation': False
+                }
+                continue
             
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f'Token transfer error: {str(e)}',
-                'simulation': False
-            }
+            transaction = self._build_transfer_tx(token, self.w3.to_checksum_address(receiver), amount, nonce, token_amount)
+            try:
+                raw_tx = self._sign_transfer(account, transaction)
+            except Exception as e:
+                results[index] = {'success': False, 'error': f'Transfer error: {str(e)}', 'simulation': False}
+                continue
+            
+            try:
+                tx_hash = self._send_signed(raw_tx)
+            except ValueError as e:
+                # JSON-RPC error response - the node rejected it, so the next receiver reuses the nonce
+                results[index] = {'success': False, 'error': f'Transfer error: {str(e)}', 'simulation': False}
+                continue
+            except Exception as e:
+                # Timeout or dropped connection: the node may still have accepted it, so its nonce cannot be reused.
+                # Stop here and let the receipt decide - later nonces would queue behind it if it never arrived
+                print(f"⚠️ Bulk transfer: broadcast to {receiver} uncertain ({e}), not sending the rest")
+                sent.append((index, self.w3.keccak(raw_tx)))
+                for later in range(index + 1, len(receivers)):
+                    results[later] = {
+                        'success': False,
+                        'error': f'Transfer not sent: broadcast of an earlier transfer is unconfirmed ({str(e)})',
+                        'simulation': False
+                    }
+                break
+            
+            nonce += 1
+            remaining_balance -= cost_per_transfer
+            sent.append((index, tx_hash))
+        
+        print(f"📦 Bulk transfer: broadcast {len(sent)}/{len(receivers)} {token} transfers")
+        
+        # 2) Collect receipts - by the time the first one lands most of the others have too
+        for index, tx_hash in sent:
+            results[index] = self._transfer_result(tx_hash, token, amount, receivers[index])
+        
+        return results
     
+    def get_token_decimals(self, token: str) -> int:
+        """Token decimals from the contract, falling back to the known RISE testnet values"""
+        try:
+            erc20_abi = [
+                {
+                    "constant": True,
+                    "inputs": [],
+                    "name": "decimals",
+                    "outputs": [{"name": "", "type": "uint8"}],
+                    "type": "function"
+                }
+            ]
+            contract = self.w3.eth.contract(address=self.contracts[token], abi=erc20_abi)
+            return contract.functions.decimals().call()
+        except Exception as e:
+            print(f"⚠️ Could not get decimals from contract, using fallback: {e}")
+            if token == 'USDT':
+                return 8  # USDT has 8 decimals on RISE Chain
+            if token == 'USDC':
+                return 6  # USDC has 6 decimals
+            return 18
+
     def _estimate_swap_gas(self, from_token: str, to_token: str, dex: str) -> int:
         """Swap için gas tahmini"""
         base_gas = {
@@ -760,7 +876,7 @@ class BlockchainIntegrator:
                 'block_number': receipt.blockNumber,
                 'gas_used': receipt.gasUsed,
                 'confirmations': self.w3.eth.block_number - receipt.blockNumber,
-                'explorer_url': f"https://explorer.testnet.riselabs.xyz/tx/{tx_hash}"
+                'explorer_url': EXPLORER_TX_URL.format(tx_hash)
             }
             
         except TransactionNotFound:
@@ -770,36 +886,20 @@ class BlockchainIntegrator:
 
     def _build_swap_data(self, amount_wei: int, to_token: str = 'USDT') -> str:
         """Manuel başarılı işlemlerden alınan gerçek data'ları dinamik deadline ile kullan"""
-        import time
-        
-        # Şimdiki zaman + 2 saat deadline (güvenli)
-        current_time = int(time.time())
-        deadline = current_time + 7200  # 2 saat = 7200 saniye
-        deadline_hex = hex(deadline)[2:].zfill(64)
-        
-        # Token'a göre gerçek manuel işlem data'larını kullan
-        base_data = 'c0e8e89a000000000000000000000000000000000000000000000000000000000000008000000000000000000000000000000000000000000000000000000000000001a000000000000000000000000000000000000000000000000000000000000001e0'
-        
-        if to_token == 'USDC':
-            # ETH to USDC (manuel işlemden)
-            rest_data = '0000000000000000000000000000000000000000000000000000000000000001000000000000000000000000000000000000000000000000000000000000002000000000000000008a13e3edac55c600b04b38b83431cba8b0a877c51c61180d0000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000009184e72a000000000000000000000000000000000000000000000000000000000000000874700000000000000000000000000000000000000000000000000000000000000a00000000000000000000000000000000000000000000000000000000000000020000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000010000000000000000000000008a93d247134d91e0de6f96547cb0204e5be8e5d80000000000000000000000000000000000000000000000000000000000000000'
-        elif to_token == 'RISE':
-            # ETH to RISE (manuel işlemden) - deadline template ile
-            template_data = 'c0e8e89a000000000000000000000000000000000000000000000000000000000000008000000000000000000000000000000000000000000000000000000000000001a000000000000000000000000000000000000000000000000000000000000001e00000000000000000000000000000000000000000000000000000000068bb01c0000000000000000000000000000000000000000000000000000000000000000100000000000000000000000000000000000000000000000000000000000000200000000000000000feb0c33520304fadae893d78c1d1f9834fbb47ee2987b66b0000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000009184e72a00000000000000000000000000000000000000000000000000000328ff9bf2c1a2000000000000000000000000000000000000000000000000000000000000000a0000000000000000000000000000000000000000000000000000000000000002000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001000000000000000000000000d6e1afe5ca8d00a2efc01b89997abe2de47fdfaf0000000000000000000000000000000000000000000000000000000000000000'
-            # Template'daki eski deadline'ı (68bb01c0) yeni deadline ile değiştir
-            new_deadline_hex = hex(deadline)[2:].zfill(8)  # 8 karakter (32-bit)
-            full_data = template_data.replace('68bb01c0', new_deadline_hex)
-            return full_data
-        else:
+        tail = _SWAP_DATA_TAILS.get(to_token)
+        if tail is None:
             # Desteklenmeyen token
             raise ValueError(f"ETH → {to_token} swap desteklenmiyor. Sadece ETH → USDC ve ETH → RISE destekleniyor.")
         
-        # Tam data: base + dinamik deadline + rest  
-        full_data = base_data + deadline_hex + rest_data
+        # Şimdiki zaman + 2 saat deadline (güvenli)
+        deadline = int(time.time()) + 7200  # 2 saat = 7200 saniye
+        
+        # Tam data: base + dinamik deadline + rest
+        full_data = _SWAP_DATA_HEAD + format(deadline, '064x') + tail
         
-        print(f"🎯 Manuel başarılı işlem data'sı kullanılıyor: ETH to {to_token}")
-        print(f"🕐 Deadline: {deadline} ({hex(deadline)})")
-        print(f"💰 Amount: {amount_wei} wei ({self.w3.from_wei(amount_wei, 'ether')} ETH)")
+        logger.debug("Manuel başarılı işlem data'sı kullanılıyor: ETH to %s", to_token)
+        logger.debug("Deadline: %s (%s)", deadline, hex(deadline))
+        logger.debug("Amount: %s wei", amount_wei)
         return full_data
     
     def _build_token_to_token_swap_data(self, from_token: str, to_token: str, amount: float, recipient_address: str) -> str:
@@ -860,15 +960,7 @@ class BlockchainIntegrator:
 
     def get_explorer_url(self, tx_hash: str, network: str = 'rise-testnet') -> str:
         """Blockchain explorer URL'ini oluştur"""
-        base_urls = {
-            'mainnet': 'https://etherscan.io',
-            'goerli': 'https://goerli.etherscan.io',
-            'sepolia': 'https://sepolia.etherscan.io',
-            'rise-testnet': 'https://explorer.testnet.riselabs.xyz',
-            'rise-mainnet': 'https://explorer.riselabs.xyz'
-        }
-        
-        base_url = base_urls.get(network, base_urls['rise-testnet'])
+        base_url = EXPLORER_BASE_URLS.get(network, EXPLORER_BASE_URLS['rise-testnet'])
         return f"{base_url}/tx/{tx_hash}"
     
     # Backward compatibility
@@ -876,8 +968,44 @@ class BlockchainIntegrator:
         """Etherscan URL'ini oluştur (backward compatibility)"""
         return self.get_explorer_url(tx_hash, network)
 
-# Singleton instance
+class GasOracle:
+    """Network gas price refreshed on a background thread - request threads only read an int"""
+    
+    def __init__(self, integrator: BlockchainIntegrator, default_price: int = DEFAULT_GAS_PRICE_WEI,
+                 interval: float = GAS_PRICE_REFRESH_INTERVAL):
+        self._integrator = integrator
+        self._price = default_price  # served until the first refresh succeeds
+        self._interval = interval
+        self._started = False
+        self._start_lock = threading.Lock()
+    
+    @property
+    def price(self) -> int:
+        """Latest gas price in wei (the refresher starts on first read, not at import)"""
+        if not self._started:
+            self._start()
+        return self._price
+    
+    def _start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            threading.Thread(target=self._refresh_loop, name='gas-oracle', daemon=True).start()
+            self._started = True
+    
+    def _refresh_loop(self):
+        while True:
+            w3 = self._integrator.w3
+            if w3 is not None:
+                try:
+                    self._price = int(w3.eth.gas_price)  # single reference swap - safe to read from any thread
+                except Exception as e:
+                    logger.debug("Gas price refresh failed: %s", e)
+            time.sleep(self._interval)
+
+# Singleton instances
 blockchain_integrator = BlockchainIntegrator()
+gas_oracle = GasOracle(blockchain_integrator)
 
 # Utility functions
 def validate_wallet_address(address: str) -> bool:
@@ -0,0 +1,15 @@
+# Gunicorn settings for running the backend in production:
+#   gunicorn -c gunicorn.conf.py app:app
+#
+# Sessions, authorized addresses and the connected wallet live in process memory,
+# so everything runs in one worker process. Concurrency comes from its thread pool:
+# blocking RPC calls release the GIL, so a slow swap only occupies one thread.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = 1
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+
+# Two-step swaps wait for two receipts (up to 60s each)
+timeout = 150
@@ -10,6 +10,7 @@ import json
 import os
 import time
 import re
+import threading
 from typing import Dict, List, Optional
 from datetime import datetime
 import logging
@@ -28,6 +29,8 @@ class FreePhishingDetector:
         # Cache system
         self._cache = {}
         self._cache_ttl = 300  # 5 dakika cache
+        self._cache_max_size = 2048  # en eski kayıtlar silinir
+        self._cache_lock = threading.Lock()  # Flask thread'leri okur, verify event loop'u yazar
         
         # Rate limiting (ücretsiz tier limits)
         self._last_request = {}
@@ -67,9 +70,8 @@ class FreePhishingDetector:
             
             # Cache kontrolü
             cache_key = f"verify_{address.lower()}"
-            if self._check_cache(cache_key):
-                cached_result = self._cache[cache_key]['data']
-                cached_result['from_cache'] = True
+            cached_result = self.get_cached_result(address)
+            if cached_result is not None:
                 return cached_result
             
             print(f"🔍 Verifying address: {address}")
@@ -87,10 +89,14 @@ class FreePhishingDetector:
             analysis = self._combine_results(address, results)
             
             # Cache'e kaydet
-            self._cache[cache_key] = {
-                'data': analysis,
-                'timestamp': time.time()
-            }
+            with self._cache_lock:
+                self._cache.pop(cache_key, None)  # yeniden eklenince sona geçsin
+                self._cache[cache_key] = {
+                    'data': analysis,
+                    'timestamp': time.time()
+                }
+                if len(self._cache) > self._cache_max_size:
+                    self._cache.pop(next(iter(self._cache)), None)
             
             return analysis
             
@@ -391,12 +397,18 @@ class FreePhishingDetector:
         """Rate limit güncelle"""
         self._last_request[source] = time.time()
     
-    def _check_cache(self, key: str) -> bool:
-        """Cache kontrolü"""
-        if key in self._cache:
-            cache_time = self._cache[key]['timestamp']
-            return (time.time() - cache_time) < self._cache_ttl
-        return False
+    def get_cached_result(self, address: str) -> Optional[Dict]:
+        """Son 5 dakikada yapılmış analiz varsa döndür - event loop gerektirmez"""
+        cache_key = f"verify_{address.lower()}"
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+        if entry is None or (time.time() - entry['timestamp']) >= self._cache_ttl:
+            return None
+        
+        # Kopya döndür - paylaşılan cache kaydı değiştirilmesin
+        cached_result = dict(entry['data'])
+        cached_result['from_cache'] = True
+        return cached_result
 
 # Global instance
 phishing_detector = FreePhishingDetector()
@@ -3,12 +3,21 @@ Swap Agent - Token Swap Optimization
 EthIstanbul Hackathon Project
 """
 
+import copy
 import json
 import time
 import random
+import threading
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from cachetools import TTLCache
+
+# Chat quotes and swap commands for the same swap repeat within seconds - reuse the computed route briefly.
+# prepare_swap has its own cache of route + calldata (app.PREPARE_SWAP_CACHE_TTL) and asks for a fresh
+# route when it builds, so a prepared swap is never older than its own TTL
+ROUTE_CACHE_TTL = 3  # seconds
+ROUTE_CACHE_SIZE = 1024
 
 @dataclass
 class Pool:
@@ -49,6 +58,10 @@ class SwapAgent:
         # Liquidity pools (simulated)
         self.pools = self._initialize_pools()
         
+        # Successful routes by (from_token, to_token, amount) - callers get deep copies
+        self._route_cache = TTLCache(maxsize=ROUTE_CACHE_SIZE, ttl=ROUTE_CACHE_TTL)
+        self._route_cache_lock = threading.Lock()
+        
         print("🔄 Swap Agent initialized with", len(self.pools), "pools")
     
     def _initialize_pools(self) -> List[Pool]:
@@ -84,7 +97,33 @@ class SwapAgent:
         """Return all supported tokens"""
         return self.supported_tokens.copy()
     
-    def find_best_swap_route(self, from_token: str, to_token: str, amount: float) -> Dict:
+    def find_best_swap_route(self, from_token: str, to_token: str, amount: float, use_cache: bool = True) -> Dict:
+        """
+        Find the best swap route (successful routes are reused for ROUTE_CACHE_TTL seconds)
+        
+        Args:
+            from_token: Source token
+            to_token: Target token
+            amount: Amount to swap
+            use_cache: False always computes a fresh route (it still refreshes the cache)
+            
+        Returns:
+            Dict: Route details and results - a private copy the caller may modify
+        """
+        key = (from_token, to_token, amount)
+        if use_cache:
+            with self._route_cache_lock:
+                cached = self._route_cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+        
+        result = self._find_best_swap_route(from_token, to_token, amount)
+        if result['success']:
+            with self._route_cache_lock:
+                self._route_cache[key] = copy.deepcopy(result)
+        return result
+    
+    def _find_best_swap_route(self, from_token: str, to_token: str, amount: float) -> Dict:
         """
         Find the best swap route
         
@@ -11,6 +11,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from security_utils import wallet_security, validate_ethereum_address
 
+def normalize_tx_hash(tx_hash: str) -> str:
+    """Transaction hash with its 0x prefix (HexBytes.hex() drops it on newer hexbytes)"""
+    return tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
+
 @dataclass
 class WalletInfo:
     """Wallet information"""
@@ -157,6 +161,7 @@ class WalletManager:
             )
             
             self.connected_wallet = wallet_info
+            self.private_key = None  # önceki private key bu cüzdana ait değil
             
             return {
                 'success': True,
@@ -269,9 +274,11 @@ class WalletManager:
             )
             
             if transfer_result['success']:
+                tx_hash = normalize_tx_hash(transfer_result['tx_hash'])
+                
                 # Add to real transaction history
                 transaction_record = {
-                    'tx_hash': transfer_result['tx_hash'],
+                    'tx_hash': tx_hash,
                     'type': 'transfer',
                     'token': token,
                     'amount': amount,
@@ -286,7 +293,7 @@ class WalletManager:
                 
                 return {
                     'success': True,
-                    'tx_hash': transfer_result['tx_hash'],
+                    'tx_hash': tx_hash,
                     'amount': amount,
                     'token': token,
                     'receiver': receiver,
@@ -303,6 +310,58 @@ class WalletManager:
                 'error': f'Transfer transaction error: {str(e)}'
             }
     
+    def execute_bulk_transfer(self, amount: float, token: str, receivers: List[str]) -> List[Dict]:
+        """Execute the same transfer to several receivers as one batch - one result per receiver"""
+        if not self.connected_wallet:
+            return [{
+                'success': False,
+                'error': 'Wallet not connected'
+            } for _ in receivers]
+        
+        try:
+            from blockchain_integration import blockchain_integrator
+            
+            transfer_results = blockchain_integrator.execute_bulk_transfer(token, amount, receivers)
+        except Exception as e:
+            return [{
+                'success': False,
+                'error': f'Transfer transaction error: {str(e)}'
+            } for _ in receivers]
+        
+        # One timestamp for the whole batch
+        recorded_at = datetime.now().isoformat()
+        results = []
+        for receiver, transfer_result in zip(receivers, transfer_results):
+            if not transfer_result['success']:
+                results.append(transfer_result)
+                continue
+            
+            tx_hash = normalize_tx_hash(transfer_result['tx_hash'])
+            self.transaction_history.append({
+                'tx_hash': tx_hash,
+                'type': 'transfer',
+                'token': token,
+                'amount': amount,
+                'receiver': receiver,
+                'timestamp': recorded_at,
+                'status': transfer_result.get('status', 'pending'),
+                'gas_used': transfer_result.get('gas_used', 0),
+                'real_transaction': True  # Real transaction flag
+            })
+            
+            results.append({
+                'success': True,
+                'tx_hash': tx_hash,
+                'amount': amount,
+                'token': token,
+                'receiver': receiver,
+                'gas_used': transfer_result.get('gas_used', 0),
+                'explorer_url': transfer_result.get('explorer_url'),
+                'status': transfer_result.get('status', 'pending')
+            })
+        
+        return results
+
     def get_transaction_history(self) -> List[Dict]:
         """Get transaction history"""
         return self.transaction_history.copy()
@@ -399,9 +458,10 @@ class WalletManager:
                 
                 print(f"✅ Approval successful: {approval_result['tx_hash']}")
                 
-                # Wait a bit for approval to be mined
-                import time
-                time.sleep(3)
+                # The approval receipt was already awaited - only wait if it timed out still pending
+                if approval_result.get('status') == 'pending':
+                    import time
+                    time.sleep(3)
             
             # Step 2: Execute the actual swap
             print(f"🔄 Step 2: Executing swap {from_token} → {to_token}...")